@@ -0,0 +1,156 @@
+"""
+Run the whole benchmark suite without asv and keep the results per commit.
+
+    python -m benchmarks                      # every benchmark, results saved
+    python -m benchmarks -b plot -b Pie       # modules/classes matching a regex
+    python -m benchmarks --quick              # time each benchmark only once
+    python -m benchmarks --compare HEAD~1     # this run against saved results
+
+Results go to ``.benchmarks/<commit>.json`` at the repository root (with a
+``-dirty`` suffix for uncommitted trees). Runs of a subset are merged into
+the file for the same commit, so a full picture can be built up piecewise.
+"""
+import argparse
+import datetime
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import platform
+import re
+import subprocess
+import sys
+
+import benchmarks
+from benchmarks.common import format_value, label, measure
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, '.benchmarks')
+KINDS = ('time', 'timeraw', 'peakmem', 'track')
+
+
+def _git(*args):
+    try:
+        out = subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def commit_id(rev='HEAD'):
+    """Short hash of `rev`, with -dirty for HEAD when tracked files changed."""
+    sha = _git('rev-parse', '--short=12', rev)
+    if sha is None:
+        return 'unknown'
+    if rev == 'HEAD' and _git('status', '--porcelain', '--untracked-files=no'):
+        sha += '-dirty'
+    return sha
+
+
+def discover(patterns=()):
+    """Benchmark classes of every bench_* module whose 'module.Class' matches a pattern."""
+    found = []
+    for module_info in sorted(pkgutil.iter_modules(benchmarks.__path__), key=lambda m: m.name):
+        if not module_info.name.startswith('bench_'):
+            continue
+        module = importlib.import_module(f'benchmarks.{module_info.name}')
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            if not any(attr.split('_')[0] in KINDS for attr in dir(cls)):
+                continue
+            qualified = f'{module_info.name}.{name}'
+            if not patterns or any(re.search(pattern, qualified) for pattern in patterns):
+                found.append((module_info.name, cls))
+    return found
+
+
+def environment():
+    import matplotlib
+    import numpy
+    import pandas
+    return {'machine': platform.node(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version(),
+            'numpy': numpy.__version__,
+            'pandas': pandas.__version__,
+            'matplotlib': matplotlib.__version__}
+
+
+def results_path(commit):
+    return os.path.join(RESULTS_DIR, f'{commit}.json')
+
+
+def load(commit):
+    path = commit if commit.endswith('.json') else results_path(commit)
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(commit, results):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = results_path(commit)
+    saved = {'results': {}}
+    if os.path.exists(path):
+        saved = load(commit)
+    saved.update(commit=commit, date=datetime.datetime.now().isoformat(timespec='seconds'),
+                 environment=environment())
+    saved['results'].update(results)
+    with open(path, 'w') as f:
+        json.dump(saved, f, indent=1, sort_keys=True)
+    return path
+
+
+def compare(before, after, threshold=0.1):
+    """Print results found in both runs, with after/before ratios; flag changes beyond `threshold`."""
+    print(f"\n{'benchmark':<70} {'before':>12} {'after':>12} {'ratio':>7}")
+    for key in sorted(set(before) & set(after)):
+        old, new = before[key], after[key]
+        if not isinstance(old['value'], (int, float)) or not isinstance(new['value'], (int, float)):
+            continue
+        ratio = new['value'] / old['value'] if old['value'] else float('inf')
+        flag = ' +' if ratio > 1 + threshold else ' -' if ratio < 1 - threshold else ''
+        print(f"{key:<70} {format_value(old['kind'], old['value']):>12} "
+              f"{format_value(new['kind'], new['value']):>12} {ratio:>7.2f}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-b', '--bench', action='append', default=[],
+                        help="regex on 'module.Class' selecting what to run; repeatable")
+    parser.add_argument('--quick', action='store_true', help="time each benchmark once")
+    parser.add_argument('--repeat', type=int, default=5, help="timing repeats (default 5)")
+    parser.add_argument('--no-save', action='store_true', help="do not write the results file")
+    parser.add_argument('--compare', metavar='REV',
+                        help="commit (or results file) to compare this run against")
+    parser.add_argument('--no-run', action='store_true',
+                        help="with --compare, compare the saved results of HEAD instead of running")
+    args = parser.parse_args(argv)
+    
+    commit = commit_id()
+    if args.no_run:
+        results = load(commit)['results']
+    else:
+        results = {}
+        for module, cls in discover(args.bench):
+            try:
+                for name, params, kind, value in measure(cls, repeat=args.repeat, quick=args.quick):
+                    key = f'{module}.{label(name, params)}'
+                    results[key] = {'kind': kind, 'params': list(params), 'value': value}
+                    print(f"{key:<70} {format_value(kind, value)}", flush=True)
+            except Exception as exc:
+                # one broken benchmark should not cost the rest of the run
+                print(f"{module}.{cls.__name__:<60} failed: {exc!r}", file=sys.stderr)
+        if not args.no_save:
+            print(f"\nsaved {save(commit, results)}")
+    
+    if args.compare:
+        baseline = args.compare if args.compare.endswith('.json') else commit_id(args.compare)
+        compare(load(baseline)['results'], results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Time the caller spends in autosave, synchronous vs background writer.
+"""
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import run
+
+from customplotlib.base import Customplotlib
+
+
+class Autosave:
+
+    params = [False, True]
+    param_names = ['background_save']
+
+    def setup(self, background_save):
+        self.plt = Customplotlib(override_autosave=True, background_save=background_save)
+        self.plt.savepath = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        self.x = np.arange(10_000)
+        self.y = rng.standard_normal(10_000).cumsum()
+
+    def teardown(self, background_save):
+        self.plt.flush()
+        self.plt.close('all')
+        shutil.rmtree(self.plt.savepath, ignore_errors=True)
+
+    def _chart(self):
+        self.plt.figure()
+        self.plt.plot(x=self.x, y=self.y, title='autosave')
+        self.plt.close()
+
+    def _burst(self, charts=8):
+        # stay under the writer's queue size, so the caller never waits for it
+        self.plt.flush()
+        start = time.perf_counter()
+        for _ in range(charts):
+            self._chart()
+        caller = time.perf_counter() - start
+        self.plt.flush()
+        return caller, time.perf_counter() - start
+
+    def track_burst_caller_seconds(self, background_save):
+        return min(self._burst()[0] for _ in range(3))
+    track_burst_caller_seconds.unit = 'seconds'
+
+    def track_burst_total_seconds(self, background_save):
+        return min(self._burst()[1] for _ in range(3))
+    track_burst_total_seconds.unit = 'seconds'
+
+
+if __name__ == '__main__':
+    run(Autosave, repeat=3)
@@ -0,0 +1,46 @@
+"""
+Throughput of ``Customplotlib.render_batch`` as workers are added.
+
+On an idle machine the time should drop close to linearly up to the number
+of cores.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import run
+
+from customplotlib.base import Customplotlib
+
+
+def specs(charts, seed=0):
+    rng = np.random.default_rng(seed)
+    out = []
+    for ix in range(charts):
+        df = pd.DataFrame({'x': np.arange(2_000),
+                           'y': rng.standard_normal(2_000).cumsum(),
+                           'group': np.repeat(list('abcd'), 500)})
+        if ix % 2:
+            out.append({'method': 'plot', 'kwargs': {'data': df, 'x': 'x', 'y': 'y', 'label': 'group'}})
+        else:
+            out.append({'method': 'scatter', 'kwargs': {'data': df, 'x': 'x', 'y': 'y', 'color': 'group'}})
+    return out
+
+
+class RenderBatch:
+
+    params = sorted({1, 2, 4, os.cpu_count() or 1})
+    param_names = ['workers']
+    timeout = 300
+
+    def setup(self, workers):
+        self.plt = Customplotlib(override_autosave=False)
+        self.specs = specs(32)
+
+    def time_32_charts(self, workers):
+        self.plt.render_batch(self.specs, workers=workers)
+
+
+if __name__ == '__main__':
+    run(RenderBatch, repeat=1)
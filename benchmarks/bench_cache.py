@@ -0,0 +1,48 @@
+"""
+The render cache: a chart drawn and autosaved against the same chart drawn
+with its autosave copied from the cache, and the cost of computing the key
+alone.
+"""
+import shutil
+import tempfile
+
+from benchmarks.common import run
+from benchmarks.data import points
+
+from customplotlib import cache as caching
+from customplotlib.base import Customplotlib
+
+
+class Render:
+
+    params = [10000, 200000]
+    param_names = ['n']
+
+    def setup(self, n):
+        self.directory = tempfile.mkdtemp()
+        self.df = points(n, 10)
+        self.uncached = Customplotlib()
+        self.cached = Customplotlib(cache=self.directory + '/cache')
+        for plt in (self.uncached, self.cached):
+            plt.savepath = self.directory + '/saved'
+        self.cached.scatter(x='x', y='y', label='group', data=self.df)
+        self.cached.close('all')
+
+    def teardown(self, n):
+        self.cached.close('all')
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_render(self, n):
+        self.uncached.scatter(x='x', y='y', label='group', data=self.df)
+        self.uncached.close()
+
+    def time_hit(self, n):
+        self.cached.scatter(x='x', y='y', label='group', data=self.df)
+        self.cached.close()
+
+    def time_key(self, n):
+        caching.render_key('scatter', (), {'x': 'x', 'y': 'y', 'label': 'group', 'data': self.df}, ())
+
+
+if __name__ == '__main__':
+    run(Render, repeat=3)
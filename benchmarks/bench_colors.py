@@ -0,0 +1,38 @@
+"""
+Bulk color conversion in ``customization.processing``.
+"""
+import numpy as np
+
+from benchmarks.common import run
+
+from customplotlib.customization import processing
+
+
+class ColorConversion:
+
+    params = [1_000, 50_000, 1_000_000]
+    param_names = ['n']
+
+    def setup(self, n):
+        rng = np.random.default_rng(0)
+        self.names = rng.choice(list(processing.COLOR_INDEX), n)
+        self.hexes = processing.get_hex_colors(self.names)
+        self.rgb = rng.integers(0, 256, (n, 3))
+
+    def time_names_to_rgb(self, n):
+        processing.get_rgb_colors(self.names)
+
+    def time_hex_to_rgba_float(self, n):
+        processing.get_rgb_colors(self.hexes, alpha=0.5, dtype=float)
+
+    def time_rgb_to_hex(self, n):
+        processing.get_hex_colors(self.rgb)
+
+    def time_names_to_rgb_one_at_a_time(self, n):
+        if n > 50_000:
+            raise NotImplementedError
+        [processing.get_rgb_color(c) for c in self.names]
+
+
+if __name__ == '__main__':
+    run(ColorConversion, repeat=3)
@@ -0,0 +1,39 @@
+"""
+Cost of building ``Customplotlib`` instances.
+
+The first construction in a process scans the font directory and registers
+every font with matplotlib; later constructions should reuse that work.
+"""
+import sys
+
+from benchmarks.common import run
+
+from customplotlib import base
+from customplotlib.base import Customplotlib
+
+
+class Construction:
+
+    def time_cold(self):
+        # forget what the registry knows so the directory is scanned again
+        base._REGISTERED_FONT_PATHS.clear()
+        base._FONT_PROPERTIES.clear()
+        Customplotlib(override_autosave=False)
+
+    def time_warm(self):
+        Customplotlib(override_autosave=False)
+
+    def peakmem_hundred_instances(self):
+        [Customplotlib(override_autosave=False) for _ in range(100)]
+
+    def track_instance_dict_bytes(self):
+        return sys.getsizeof(Customplotlib(override_autosave=False).__dict__)
+
+    def track_registered_fonts(self):
+        for _ in range(100):
+            Customplotlib(override_autosave=False)
+        return len(base.fm.fontManager.ttflist)
+
+
+if __name__ == '__main__':
+    run(Construction)
@@ -0,0 +1,27 @@
+"""
+Cost of resolving gradients into colormaps with ``processing.get_gradient``.
+"""
+from benchmarks.common import run
+
+from customplotlib.customization import processing
+from customplotlib.customization.config import GRADIENTS
+
+
+class Gradient:
+
+    params = list(GRADIENTS)
+    param_names = ['gradient']
+
+    def time_cold(self, gradient):
+        processing._GRADIENT_CACHE.clear()
+        processing.get_gradient(gradient)
+
+    def time_cached(self, gradient):
+        processing.get_gradient(gradient)
+
+    def time_cached_inverted(self, gradient):
+        processing.get_gradient(gradient, invert=True)
+
+
+if __name__ == '__main__':
+    run(Gradient)
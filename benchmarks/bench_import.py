@@ -0,0 +1,69 @@
+"""
+Import time of ``customplotlib.base``.
+
+plotly and seaborn are only needed by ``pie`` and ``dist`` and must not be
+loaded by the import itself. Running this module directly checks that with
+``python -X importtime`` and exits non-zero on a regression, so it can be used
+as a guard in CI::
+
+    python -m benchmarks.bench_import [--budget SECONDS]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from benchmarks.common import run
+
+# modules that must stay out of a bare ``import customplotlib.base``
+HEAVY_MODULES = ('plotly', 'seaborn', 'scipy')
+
+
+def importtime(module='customplotlib.base'):
+    """Return ``{module: cumulative seconds}`` from ``python -X importtime``."""
+    env = dict(os.environ, MPLBACKEND='Agg')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          env=env, capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+class Import:
+
+    def timeraw_import_base(self):
+        return "import matplotlib; matplotlib.use('Agg'); import customplotlib.base"
+
+    def track_heavy_modules_loaded(self):
+        times = importtime()
+        return sum(name.split('.')[0] in HEAVY_MODULES for name in times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget', type=float, default=None,
+                        help='fail if the cumulative import time exceeds this many seconds')
+    args = parser.parse_args(argv)
+
+    run(Import)
+
+    times = importtime()
+    total = times['customplotlib.base']
+    heavy = sorted({name.split('.')[0] for name in times} & set(HEAVY_MODULES))
+    print(f"import customplotlib.base: {total:.3f}s cumulative")
+    failed = False
+    if heavy:
+        print(f"heavy modules imported eagerly: {', '.join(heavy)}")
+        failed = True
+    if args.budget is not None and total > args.budget:
+        print(f"import time exceeds the budget of {args.budget:.3f}s")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
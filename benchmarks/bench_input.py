@@ -0,0 +1,42 @@
+"""
+Memory used to get data out of a wide frame passed with ``data=``.
+
+Only the x, y and label columns should be read; the rest of the frame must
+not be copied.
+"""
+from benchmarks.common import run
+from benchmarks.data import wide_frame
+
+from customplotlib.base import Customplotlib
+
+
+class WideFrameInput:
+
+    params = [[1_000_000], [False, True]]
+    param_names = ['n', 'collection']
+
+    def setup(self, n, collection):
+        self.plt = Customplotlib(override_autosave=False)
+        self.df = wide_frame(n, 20)
+
+    def teardown(self, n, collection):
+        self.plt.close('all')
+
+    def peakmem_plot(self, n, collection):
+        self.plt.figure()
+        self.plt.plot(data=self.df, x='x', y='y', label='group', collection=collection, legend=False)
+        self.plt.close()
+
+    def peakmem_scatter(self, n, collection):
+        self.plt.figure()
+        self.plt.scatter(data=self.df, x='x', y='y', label='group', collection=collection, legend=False)
+        self.plt.close()
+
+    def time_scatter(self, n, collection):
+        self.plt.figure()
+        self.plt.scatter(data=self.df, x='x', y='y', label='group', collection=collection, legend=False)
+        self.plt.close()
+
+
+if __name__ == '__main__':
+    run(WideFrameInput, repeat=3)
@@ -0,0 +1,47 @@
+"""
+Cost of per-call instrumentation: a small labelled plot with it off, with
+plain phase timing, and with cProfile or tracemalloc capture.
+"""
+from benchmarks.common import run
+from benchmarks.data import points
+
+from customplotlib.base import Customplotlib, instrumented
+
+
+class Instrumentation:
+
+    params = [None, 'timing', 'cprofile', 'tracemalloc']
+    param_names = ['mode']
+
+    def setup(self, mode):
+        self.plt = Customplotlib(override_autosave=False,
+                                 instrument=mode is not None,
+                                 profile=None if mode == 'timing' else mode)
+        self.df = points(1000, 5)
+
+    def teardown(self, mode):
+        self.plt.close('all')
+
+    def time_plot(self, mode):
+        self.plt.figure()
+        self.plt.plot(x='x', y='y', label='group', data=self.df)
+        self.plt.close()
+
+
+class Overhead:
+    """The instrumented wrapper alone, around a method that draws nothing."""
+
+    params = [False, True]
+    param_names = ['instrument']
+
+    def setup(self, instrument):
+        self.plt = Customplotlib(override_autosave=False, instrument=instrument)
+        self.noop = instrumented(lambda plt: None)
+
+    def time_call(self, instrument):
+        for _ in range(1000):
+            self.noop(self.plt)
+
+
+if __name__ == '__main__':
+    run(Instrumentation, Overhead)
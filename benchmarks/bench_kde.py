@@ -0,0 +1,91 @@
+"""
+Kernel density estimates for ``Customplotlib.dist``: the binned FFT engine
+against seaborn, for speed and for agreement with seaborn's curve.
+"""
+import numpy as np
+from matplotlib import pyplot
+
+from benchmarks.common import run
+from benchmarks.data import claims
+
+from customplotlib import kde
+from customplotlib.base import Customplotlib
+
+
+class FFTKDE:
+
+    params = [[1_000_000, 10_000_000, 100_000_000], ['normal', 'claims']]
+    param_names = ['n', 'data']
+    timeout = 300
+
+    def setup(self, n, data):
+        if data == 'normal':
+            self.x = np.random.default_rng(0).standard_normal(n)
+        else:
+            # long tails need a finer internal grid
+            self.x = claims(n)
+
+    def time_fft_kde(self, n, data):
+        kde.fft_kde(self.x)
+
+    def peakmem_fft_kde(self, n, data):
+        kde.fft_kde(self.x)
+
+
+class Dist:
+
+    params = [[10_000, 100_000, 1_000_000], ['seaborn', 'fft']]
+    param_names = ['n', 'engine']
+    timeout = 300
+
+    def setup(self, n, engine):
+        if engine == 'seaborn' and n > 100_000:
+            # direct evaluation is O(n * gridsize) and takes seconds here
+            raise NotImplementedError
+        self.plt = Customplotlib(override_autosave=False)
+        self.x = claims(n)
+
+    def teardown(self, n, engine):
+        self.plt.close('all')
+
+    def time_dist(self, n, engine):
+        self.plt.dist(self.x, engine=engine)
+        self.plt.close()
+
+
+class Accuracy:
+    """Largest gap between the FFT and seaborn curves, as a fraction of seaborn's peak."""
+
+    params = [['normal', 'bimodal', 'lognormal', 'weighted'], ['scott', 'silverman']]
+    param_names = ['data', 'bw_method']
+
+    def setup(self, data, bw_method):
+        rng = np.random.default_rng(1)
+        self.weights = None
+        if data == 'normal':
+            self.x = rng.standard_normal(20_000)
+        elif data == 'bimodal':
+            self.x = np.r_[rng.normal(-3, 1, 10_000), rng.normal(4, 0.5, 10_000)]
+        elif data == 'lognormal':
+            self.x = claims(20_000)
+        else:
+            self.x = rng.standard_normal(20_000)
+            self.weights = rng.random(20_000)
+
+    def track_max_error(self, data, bw_method):
+        import seaborn as sns
+        
+        fig, ax = pyplot.subplots()
+        sns.kdeplot(x=self.x, weights=self.weights, bw_method=bw_method, ax=ax)
+        support, expected = ax.lines[0].get_data()
+        pyplot.close(fig)
+        
+        # seaborn sizes its grid from the unweighted bandwidth, so compare on its grid
+        actual_support, actual = kde.fft_kde(self.x, weights=self.weights, bw_method=bw_method)
+        actual = np.interp(support, actual_support, actual, left=0, right=0)
+        return float(np.abs(actual - expected).max() / expected.max())
+    track_max_error.unit = 'fraction of peak'
+
+
+if __name__ == '__main__':
+    run(Accuracy, Dist, FFTKDE, repeat=3)
@@ -0,0 +1,90 @@
+"""
+Figure lifecycle: resident memory over a long run of sequential charts under
+each policy, and the cost of one chart with and without the figure pool.
+"""
+import os
+import resource
+import shutil
+import tempfile
+
+from benchmarks.common import run
+from benchmarks.data import points
+
+from customplotlib.base import Customplotlib
+
+
+POLICIES = {
+    'none': {},
+    'close_after_save': {'close_after_save': True},
+    'keep_last_n': {'keep_last_n': 1},
+    'pool': {'keep_last_n': 1, 'pool': True},
+}
+
+# without a policy every chart stays open, and every autosave encodes a PNG,
+# so those two runs are shorter; growth is reported per 1000 charts
+CHARTS = {'none': 300, 'close_after_save': 1000, 'keep_last_n': 10000, 'pool': 10000}
+
+
+def rss():
+    """Resident set size of this process in bytes."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # peak rather than current, in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Sequential:
+    """Charts drawn one after another, as a batch job or notebook loop would."""
+
+    params = list(POLICIES)
+    param_names = ['policy']
+    timeout = 3600
+
+    def setup(self, policy):
+        self.directory = tempfile.mkdtemp()
+        self.plt = Customplotlib(override_autosave=policy == 'close_after_save', **POLICIES[policy])
+        self.plt.savepath = self.directory
+        self.df = points(1000, 5)
+
+    def teardown(self, policy):
+        self.plt.close('all')
+        if self.plt.pool is not None:
+            self.plt.pool.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def track_rss_growth(self, policy):
+        # MiB per 1000 charts after the first tenth, which warms up caches
+        charts = CHARTS[policy]
+        warm = charts // 10
+        for ix in range(charts):
+            if ix == warm:
+                start = rss()
+            if policy != 'close_after_save':
+                # each chart on a new figure, as a loop without closing would
+                self.plt.figure()
+            self.plt.scatter(x='x', y='y', label='group', data=self.df, legend=False)
+        return round((rss() - start) / 2 ** 20 / (charts - warm) * 1000, 2)
+
+
+class Chart:
+    """One small chart, drawn and closed."""
+
+    params = [False, True]
+    param_names = ['pool']
+
+    def setup(self, pool):
+        self.plt = Customplotlib(override_autosave=False, pool=pool)
+        self.df = points(1000, 5)
+
+    def teardown(self, pool):
+        self.plt.close('all')
+
+    def time_chart(self, pool):
+        self.plt.scatter(x='x', y='y', label='group', data=self.df, legend=False)
+        self.plt.close()
+
+
+if __name__ == '__main__':
+    run(Chart, Sequential, repeat=3)
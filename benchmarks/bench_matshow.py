@@ -0,0 +1,61 @@
+"""
+Correlation heatmaps of wide frames with ``Customplotlib.matshow``.
+"""
+from benchmarks.common import run
+from benchmarks.data import numeric_frame
+
+from customplotlib import correlation
+from customplotlib.base import Customplotlib
+
+
+class CorrelationMatrix:
+
+    params = [[100, 500, 2_000, 5_000], ['pearson', 'spearman']]
+    param_names = ['columns', 'method']
+    timeout = 600
+
+    def setup(self, columns, method):
+        self.names, self.values = correlation.numeric(numeric_frame(10_000, columns))
+
+    def time_correlation(self, columns, method):
+        correlation.correlation(self.values, method=method)
+
+    def peakmem_correlation(self, columns, method):
+        correlation.correlation(self.values, method=method)
+
+
+class PandasCorr:
+    """DataFrame.corr, what matshow callers computed themselves before corr=."""
+
+    params = [500]
+    param_names = ['columns']
+    timeout = 600
+
+    def setup(self, columns):
+        self.df = numeric_frame(10_000, columns).select_dtypes(['number'])
+
+    def time_pandas_corr(self, columns):
+        self.df.corr()
+
+
+class Matshow:
+
+    params = [[100, 500, 2_000], [False, True]]
+    param_names = ['columns', 'cluster']
+    timeout = 600
+
+    def setup(self, columns, cluster):
+        self.plt = Customplotlib(override_autosave=False)
+        self.df = numeric_frame(10_000, columns)
+
+    def teardown(self, columns, cluster):
+        self.plt.close('all')
+
+    def time_matshow_corr(self, columns, cluster):
+        self.plt.matshow(self.df, corr='pearson', cluster=cluster)
+        self.plt.gcf().canvas.draw()
+        self.plt.close()
+
+
+if __name__ == '__main__':
+    run(PandasCorr, CorrelationMatrix, Matshow, repeat=3)
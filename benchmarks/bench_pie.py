@@ -0,0 +1,69 @@
+"""
+Reducing rows to pie slices with ``Customplotlib.pie``, by row count.
+"""
+import shutil
+import tempfile
+
+from benchmarks.common import run
+from benchmarks.data import labelled_values
+
+from customplotlib.base import Customplotlib, pie_slices
+
+
+class PieSlices:
+
+    params = [[100_000, 1_000_000, 10_000_000], [False, True]]
+    param_names = ['rows', 'categorical']
+    timeout = 300
+
+    def setup(self, rows, categorical):
+        self.df = labelled_values(rows, categorical=categorical)
+
+    def time_pie_slices(self, rows, categorical):
+        pie_slices(self.df, 'label', 'value', other_threshold=1e-6)
+
+    def peakmem_pie_slices(self, rows, categorical):
+        pie_slices(self.df, 'label', 'value', other_threshold=1e-6)
+
+
+class Pie:
+
+    params = [1_000_000]
+    param_names = ['rows']
+
+    def setup(self, rows):
+        self.plt = Customplotlib(override_autosave=False)
+        self.df = labelled_values(rows)
+
+    def time_pie(self, rows):
+        self.plt.pie(self.df, 'label', 'value', show=False, other_threshold=1e-6)
+
+
+class PieBackend:
+    """Build and autosave one pie, plotly through Kaleido or matplotlib through Agg."""
+
+    params = [['plotly', 'matplotlib'], [False, True]]
+    param_names = ['backend', 'background_save']
+
+    def setup(self, backend, background_save):
+        if backend == 'plotly':
+            try:
+                import kaleido
+            except ImportError:
+                raise NotImplementedError
+        self.plt = Customplotlib(override_autosave=True, background_save=background_save)
+        self.plt.savepath = tempfile.mkdtemp()
+        self.df = labelled_values(100_000, labels=20)
+
+    def teardown(self, backend, background_save):
+        self.plt.flush()
+        self.plt.close('all')
+        shutil.rmtree(self.plt.savepath, ignore_errors=True)
+
+    def time_pie(self, backend, background_save):
+        self.plt.pie(self.df, 'label', 'value', backend=backend, show=False)
+        self.plt.close('all')
+
+
+if __name__ == '__main__':
+    run(PieSlices, Pie, PieBackend, repeat=3)
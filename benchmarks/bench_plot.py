@@ -0,0 +1,120 @@
+"""
+Building line plots with ``Customplotlib.plot``.
+"""
+import io
+
+import numpy as np
+
+from benchmarks.common import run
+from benchmarks.data import series
+
+from customplotlib.base import Customplotlib
+
+
+class GroupedLines:
+    """Build and draw 200k points split over many labels."""
+
+    params = [[10, 100, 1_000], [False, True]]
+    param_names = ['groups', 'collection']
+
+    def setup(self, groups, collection):
+        self.plt = Customplotlib(override_autosave=False)
+        self.df = series(200_000, groups)
+
+    def teardown(self, groups, collection):
+        self.plt.close('all')
+
+    def time_build_and_draw(self, groups, collection):
+        self.plt.figure()
+        self.plt.plot(data=self.df, x='t', y='y', label='group',
+                      collection=collection, legend_max=20 if collection else None)
+        self.plt.gcf().canvas.draw()
+        self.plt.close()
+
+
+class GroupedLinesScaling:
+    """LineCollection path as the total number of points grows."""
+
+    params = [10_000, 100_000, 1_000_000]
+    param_names = ['n']
+
+    def setup(self, n):
+        self.plt = Customplotlib(override_autosave=False)
+        self.df = series(n, 500)
+
+    def teardown(self, n):
+        self.plt.close('all')
+
+    def time_build_and_draw(self, n):
+        self.plt.figure()
+        self.plt.plot(data=self.df, x='t', y='y', label='group', collection=True, legend_max=20)
+        self.plt.gcf().canvas.draw()
+        self.plt.close()
+
+
+class Scaling:
+    """Points and labels over the full range the plot paths are used for."""
+
+    params = [[1_000, 100_000, 10_000_000], [1, 100, 10_000]]
+    param_names = ['n', 'groups']
+    timeout = 600
+
+    def setup(self, n, groups):
+        if groups * 10 > n:
+            raise NotImplementedError
+        self.plt = Customplotlib(override_autosave=False)
+        self.df = series(n, groups)
+
+    def teardown(self, n, groups):
+        self.plt.close('all')
+
+    def _chart(self, n):
+        # past a million points every line is decimated to the pixel width
+        downsample = 'minmax' if n > 1_000_000 else None
+        self.plt.figure()
+        self.plt.plot(data=self.df, x='t', y='y', label='group', collection=True,
+                      legend_max=20, downsample=downsample)
+        self.plt.gcf().canvas.draw()
+        self.plt.close()
+
+    def time_build_and_draw(self, n, groups):
+        self._chart(n)
+
+    def peakmem_build_and_draw(self, n, groups):
+        self._chart(n)
+
+
+class Downsample:
+    """A single long series rendered to PNG, with and without decimation."""
+
+    params = [[1_000_000, 20_000_000], [None, 'lttb', 'minmax']]
+    param_names = ['n', 'downsample']
+
+    def setup(self, n, downsample):
+        self.plt = Customplotlib(override_autosave=False)
+        rng = np.random.default_rng(0)
+        self.x = np.arange(n)
+        self.y = rng.standard_normal(n).cumsum()
+
+    def teardown(self, n, downsample):
+        self.plt.close('all')
+
+    def _render(self, downsample, fmt='png'):
+        self.plt.figure()
+        self.plt.plot(x=self.x, y=self.y, downsample=downsample)
+        buf = io.BytesIO()
+        self.plt.savefig(buf, format=fmt)
+        self.plt.close()
+        return buf.tell()
+
+    def time_render_png(self, n, downsample):
+        self._render(downsample)
+
+    def track_svg_bytes(self, n, downsample):
+        if n > 1_000_000:
+            raise NotImplementedError
+        return self._render(downsample, fmt='svg')
+
+
+if __name__ == '__main__':
+    run(GroupedLines, GroupedLinesScaling, Scaling, Downsample, repeat=3)
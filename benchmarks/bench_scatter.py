@@ -0,0 +1,122 @@
+"""
+Building scatter plots with ``Customplotlib.scatter``.
+"""
+from benchmarks.common import run
+from benchmarks.data import points
+
+from customplotlib.base import Customplotlib
+
+
+class ColorByColumn:
+
+    params = [10_000, 1_000_000]
+    param_names = ['n']
+
+    def setup(self, n):
+        self.plt = Customplotlib(supp_colors=True, override_autosave=False)
+        self.df = points(n, 8)
+
+    def teardown(self, n):
+        self.plt.close('all')
+
+    def time_categorical(self, n):
+        self.plt.figure()
+        self.plt.scatter(data=self.df, x='x', y='y', color='group')
+        self.plt.close()
+
+    def time_numeric(self, n):
+        self.plt.figure()
+        self.plt.scatter(data=self.df, x='x', y='y', color='value')
+        self.plt.close()
+
+
+class GroupedScatter:
+    """Build and draw 100k points split over many labels."""
+
+    params = [[10, 1_000, 10_000], [False, True]]
+    param_names = ['groups', 'collection']
+
+    def setup(self, groups, collection):
+        if groups > 1_000 and not collection:
+            # one artist per label takes minutes at this size
+            raise NotImplementedError
+        self.plt = Customplotlib(override_autosave=False)
+        self.df = points(100_000, groups)
+
+    def teardown(self, groups, collection):
+        self.plt.close('all')
+
+    def time_build_and_draw(self, groups, collection):
+        self.plt.figure()
+        self.plt.scatter(data=self.df, x='x', y='y', label='group',
+                         collection=collection, legend_max=20 if collection else None)
+        self.plt.gcf().canvas.draw()
+        self.plt.close()
+
+
+class Scaling:
+    """Points and labels over the full range the scatter paths are used for."""
+
+    params = [[1_000, 100_000, 10_000_000], [1, 100, 10_000]]
+    param_names = ['n', 'groups']
+    timeout = 600
+
+    def setup(self, n, groups):
+        if groups * 10 > n:
+            raise NotImplementedError
+        self.plt = Customplotlib(override_autosave=False)
+        self.df = points(n, groups)
+
+    def teardown(self, n, groups):
+        self.plt.close('all')
+
+    def _chart(self, n):
+        self.plt.figure()
+        if n > 1_000_000:
+            # markers for every point take minutes here; density is the path for this size
+            self.plt.scatter(data=self.df, x='x', y='y', render='density')
+        else:
+            self.plt.scatter(data=self.df, x='x', y='y', label='group', collection=True, legend_max=20)
+        self.plt.gcf().canvas.draw()
+        self.plt.close()
+
+    def time_build_and_draw(self, n, groups):
+        self._chart(n)
+
+    def peakmem_build_and_draw(self, n, groups):
+        self._chart(n)
+
+
+class Density:
+    """Build and draw many points as markers or as a density image."""
+
+    params = [[100_000, 1_000_000, 10_000_000], [None, 'density']]
+    param_names = ['n', 'render']
+
+    def setup(self, n, render):
+        if n > 1_000_000 and render is None:
+            # one marker per point takes minutes at this size
+            raise NotImplementedError
+        self.plt = Customplotlib(override_autosave=False)
+        self.df = points(n, 4)
+
+    def teardown(self, n, render):
+        self.plt.close('all')
+
+    def time_build_and_draw(self, n, render):
+        self.plt.figure()
+        self.plt.scatter(data=self.df, x='x', y='y', render=render)
+        self.plt.gcf().canvas.draw()
+        self.plt.close()
+
+    def time_build_and_draw_mean(self, n, render):
+        if render is None:
+            raise NotImplementedError
+        self.plt.figure()
+        self.plt.scatter(data=self.df, x='x', y='y', values='value', render=render)
+        self.plt.gcf().canvas.draw()
+        self.plt.close()
+
+
+if __name__ == '__main__':
+    run(ColorByColumn, GroupedScatter, Scaling, Density, repeat=3)
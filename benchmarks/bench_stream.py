@@ -0,0 +1,90 @@
+"""
+Live updates: appending to a Stream against re-plotting the window on every
+refresh, and the memory a Stream holds after a long run.
+"""
+import numpy as np
+
+from benchmarks.common import run
+
+from customplotlib.base import Customplotlib
+
+
+def walk(n, labels, seed=0):
+    """n steps of `labels` random walks, interleaved as a stream would deliver them."""
+    rng = np.random.default_rng(seed)
+    y = rng.normal(size=(n, labels)).cumsum(axis=0).ravel()
+    x = np.repeat(np.arange(n, dtype=float), labels)
+    return x, y, np.tile(np.array([f"series {ix}" for ix in range(labels)]), n)
+
+
+class Append:
+    """One refresh of a stream that has already run for `elapsed` windows."""
+
+    params = ([1000, 10000], [0, 10])
+    param_names = ['window', 'elapsed']
+
+    def setup(self, window, elapsed):
+        self.plt = Customplotlib(override_autosave=False)
+        self.plt.figure()
+        self.stream = self.plt.stream(window=window)
+        x, y, labels = walk(window * (elapsed + 1) + 10, 3)
+        self.tail = len(x) - 30
+        self.stream.append(x[:self.tail], y[:self.tail], label=labels[:self.tail])
+        self.x, self.y, self.labels = x, y, labels
+
+    def teardown(self, window, elapsed):
+        self.plt.close('all')
+
+    def time_append(self, window, elapsed):
+        # 10 refreshes of one point per series
+        for start in range(self.tail, len(self.x), 3):
+            self.stream.append(self.x[start:start + 3], self.y[start:start + 3],
+                               label=self.labels[start:start + 3])
+
+
+class Replot:
+    """The same refresh done by clearing the axes and plotting the window again."""
+
+    params = [1000, 10000]
+    param_names = ['window']
+
+    def setup(self, window):
+        self.plt = Customplotlib(override_autosave=False)
+        self.plt.figure()
+        self.x, self.y, self.labels = walk(window, 3)
+
+    def teardown(self, window):
+        self.plt.close('all')
+
+    def time_refresh(self, window):
+        # 10 refreshes, as in Append
+        for _ in range(10):
+            self.plt.cla()
+            self.plt.plot(x=self.x, y=self.y, label=self.labels)
+            self.plt.gcf().canvas.draw()
+
+
+class Memory:
+
+    params = [10, 100]
+    param_names = ['windows']
+
+    def setup(self, windows):
+        self.plt = Customplotlib(override_autosave=False)
+        self.plt.figure()
+        self.x, self.y, self.labels = walk(1000 * windows, 3)
+
+    def teardown(self, windows):
+        self.plt.close('all')
+
+    def track_buffered_bytes(self, windows):
+        stream = self.plt.stream(window=1000)
+        for start in range(0, len(self.x), 3000):
+            stream.append(self.x[start:start + 3000], self.y[start:start + 3000],
+                          label=self.labels[start:start + 3000])
+        return sum(buf._data.nbytes for pair in stream.buffers.values() for buf in pair)
+    track_buffered_bytes.unit = 'bytes'
+
+
+if __name__ == '__main__':
+    run(Append, Replot, Memory, repeat=3)
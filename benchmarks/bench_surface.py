@@ -0,0 +1,83 @@
+"""
+3D surfaces with ``Customplotlib.three_d_plot``: gridded points through
+plot_surface, scattered points through a cached triangulation.
+"""
+import numpy as np
+
+from benchmarks.common import run
+from benchmarks.data import grid_points, scattered_points
+
+from customplotlib import surface
+from customplotlib.base import Customplotlib
+
+
+class Gridded:
+
+    params = [[100, 300], [None, 4]]
+    param_names = ['side', 'stride']
+    timeout = 300
+
+    def setup(self, side, stride):
+        self.plt = Customplotlib(override_autosave=False)
+        self.x, self.y, self.z = grid_points(side)
+
+    def teardown(self, side, stride):
+        self.plt.close('all')
+
+    def time_three_d_plot(self, side, stride):
+        self.plt.three_d_plot(self.x, self.y, self.z, stride=stride)
+        self.plt.gcf().canvas.draw()
+        self.plt.close()
+
+    def time_trisurf(self, side, stride):
+        # what three_d_plot drew for the same points before
+        if stride is not None:
+            raise NotImplementedError
+        ax = self.plt.figure().add_subplot(projection='3d')
+        ax.plot_trisurf(self.x, self.y, self.z, linewidth=0.1)
+        self.plt.gcf().canvas.draw()
+        self.plt.close()
+
+
+class Triangulation:
+    """Triangulating scattered points, fresh against cached."""
+
+    params = [[10_000, 100_000], [False, True]]
+    param_names = ['n', 'cached']
+
+    def setup(self, n, cached):
+        self.x, self.y, self.z = scattered_points(n)
+        surface.clear_cache()
+        surface.triangulation(self.x, self.y)
+
+    def time_triangulation(self, n, cached):
+        if not cached:
+            surface.clear_cache()
+        surface.triangulation(self.x, self.y)
+
+
+class ScenarioFrames:
+    """One frame per scenario over the same scattered x/y domain."""
+
+    params = [[False, True]]
+    param_names = ['cached']
+    timeout = 300
+
+    def setup(self, cached):
+        self.plt = Customplotlib(override_autosave=False)
+        self.x, self.y, z = scattered_points(20_000)
+        self.frames = [z * scale for scale in np.linspace(0.5, 1.5, 5)]
+
+    def teardown(self, cached):
+        self.plt.close('all')
+
+    def time_five_frames(self, cached):
+        for z in self.frames:
+            if not cached:
+                surface.clear_cache()
+            self.plt.three_d_plot(self.x, self.y, z)
+            self.plt.close()
+
+
+if __name__ == '__main__':
+    run(Triangulation, ScenarioFrames, Gridded, repeat=3)
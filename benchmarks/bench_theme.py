@@ -0,0 +1,64 @@
+"""
+Switching between Customplotlib themes: global apply against scoped
+rc_context, and instances with different palettes side by side.
+"""
+import numpy as np
+
+from benchmarks.common import run
+
+from customplotlib.base import Customplotlib
+
+
+class ThemeSwitch:
+
+    def setup(self):
+        self.mains = Customplotlib(override_autosave=False, scoped=True)
+        self.supps = Customplotlib(supp_colors=True, override_autosave=False, scoped=True)
+
+    def time_apply(self):
+        self.mains.theme.apply()
+        self.supps.theme.apply()
+
+    def time_context(self):
+        with self.mains.theme.context():
+            pass
+        with self.supps.theme.context():
+            pass
+
+
+class AlternatingPalettes:
+    """Charts from two instances with different palettes, one after the other."""
+
+    params = [False, True]
+    param_names = ['scoped']
+
+    def setup(self, scoped):
+        self.instances = [Customplotlib(override_autosave=False, scoped=scoped),
+                          Customplotlib(supp_colors=True, override_autosave=False, scoped=scoped)]
+        self.x = np.arange(100)
+
+    def teardown(self, scoped):
+        self.instances[0].close('all')
+
+    def time_two_charts(self, scoped):
+        for plt in self.instances:
+            plt.figure()
+            plt.plot(x=self.x, y=self.x)
+            plt.close()
+
+    def track_wrong_palette_charts(self, scoped):
+        # charts drawn in another instance's colors once both exist
+        # both palettes start with the same green, so look at the second line
+        wrong = 0
+        for plt in self.instances * 5:
+            plt.figure()
+            plt.plot(x=self.x, y=self.x)
+            plt.plot(x=self.x, y=self.x)
+            wrong += plt.gca().lines[1].get_color() != plt.theme.colors[1]
+            plt.close()
+        return wrong
+    track_wrong_palette_charts.unit = 'charts'
+
+
+if __name__ == '__main__':
+    run(ThemeSwitch, AlternatingPalettes, repeat=5)
@@ -0,0 +1,51 @@
+"""
+Re-rendering the same chart with refreshed data: drawing it from scratch
+against Chart.update on the artists already there, with and without
+saving the result.
+"""
+import io
+
+from benchmarks.common import run
+from benchmarks.data import points, series
+
+from customplotlib.base import Customplotlib
+
+
+class Rerender:
+
+    params = (['plot', 'plot-collection', 'scatter', 'scatter-collection'], [10, 200], [False, True])
+    param_names = ['chart', 'groups', 'save']
+
+    def setup(self, chart, groups, save):
+        self.plt = Customplotlib(override_autosave=False)
+        self.kind = chart.split('-')[0]
+        self.kwargs = {'collection': chart.endswith('collection')}
+        data = series if self.kind == 'plot' else points
+        self.frames = [data(10000, groups, seed=seed) for seed in range(2)]
+        self.columns = ('t', 'y') if self.kind == 'plot' else ('x', 'y')
+        self.plt.figure()
+        self.chart = self._draw(self.frames[0])
+
+    def teardown(self, chart, groups, save):
+        self.plt.close('all')
+
+    def _draw(self, df):
+        x, y = self.columns
+        return getattr(self.plt, self.kind)(x=x, y=y, label='group', data=df, **self.kwargs)
+
+    def time_redraw(self, chart, groups, save):
+        for df in self.frames:
+            self.plt.clf()
+            self._draw(df)
+            if save:
+                self.plt.savefig(io.BytesIO(), format='png')
+
+    def time_update(self, chart, groups, save):
+        for df in self.frames:
+            self.chart.update(data=df)
+            if save:
+                self.plt.savefig(io.BytesIO(), format='png')
+
+
+if __name__ == '__main__':
+    run(Rerender, repeat=3)
@@ -0,0 +1,113 @@
+"""
+Shared helpers for the benchmarks in this directory.
+
+The benchmark modules follow asv conventions (classes with ``params``,
+``setup`` and ``time_*``/``peakmem_*``/``track_*`` methods) so they can be run
+by asv, but each module can also be run directly with ``python -m
+benchmarks.<module>``, which uses the small runner below.
+"""
+import itertools
+import os
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+import matplotlib
+
+# benchmarks always run headless
+matplotlib.use(os.environ.get('MPLBACKEND', 'Agg'))
+
+
+def _param_grid(cls):
+    params = getattr(cls, 'params', None)
+    if params is None:
+        return [()]
+    if params and not isinstance(params[0], (list, tuple)):
+        params = [params]
+    return list(itertools.product(*params))
+
+
+def _time(func, repeat, quick=False):
+    timer = timeit.Timer(func)
+    if quick:
+        return timer.timeit(number=1)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def _timeraw(code, repeat):
+    # asv's ``timeraw_*`` benchmarks return code that must run in a fresh
+    # interpreter, e.g. to measure import time
+    timer = timeit.Timer(lambda: subprocess.run([sys.executable, '-c', code], check=True))
+    return min(timer.repeat(repeat=repeat, number=1))
+
+
+def _peakmem(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def format_value(kind, value):
+    if kind in ('time', 'timeraw'):
+        for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+            if value >= scale:
+                return f"{value / scale:.3f}{unit}"
+        return f"{value / 1e-9:.1f}ns"
+    if kind == 'peakmem':
+        return f"{value / 2 ** 20:.2f}MiB"
+    return repr(value)
+
+
+def measure(cls, repeat=5, quick=False):
+    """
+    Yield ``(name, params, kind, value)`` for every benchmark on ``cls``.
+    
+    `quick` times each benchmark once, without a warm-up call, like asv's
+    ``--quick``.
+    """
+    names = sorted(n for n in dir(cls) if n.split('_')[0] in ('time', 'timeraw', 'peakmem', 'track'))
+    for params in _param_grid(cls):
+        for name in names:
+            bench = cls()
+            method = getattr(bench, name)
+            kind = name.split('_')[0]
+            try:
+                if hasattr(bench, 'setup'):
+                    bench.setup(*params)
+            except NotImplementedError:
+                # asv convention for parameter combinations that are skipped
+                continue
+            try:
+                if kind == 'time':
+                    if not quick:
+                        method(*params)
+                    value = _time(lambda: method(*params), repeat, quick)
+                elif kind == 'timeraw':
+                    value = _timeraw(method(*params), 1 if quick else repeat)
+                elif kind == 'peakmem':
+                    value = _peakmem(lambda: method(*params))
+                else:
+                    value = method(*params)
+            except NotImplementedError:
+                # asv convention for parameter combinations that are skipped
+                continue
+            finally:
+                if hasattr(bench, 'teardown'):
+                    bench.teardown(*params)
+            yield f"{cls.__name__}.{name}", params, kind, value
+
+
+def label(name, params):
+    return f"{name}{list(params) if params else ''}"
+
+
+def run(*classes, repeat=5, quick=False):
+    """Run benchmark classes without asv and print one line per result."""
+    for cls in classes:
+        for name, params, kind, value in measure(cls, repeat=repeat, quick=quick):
+            print(f"{label(name, params):<60} {format_value(kind, value)}")
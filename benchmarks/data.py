@@ -0,0 +1,81 @@
+"""
+Synthetic data for the benchmarks, generated from fixed seeds so every run
+sees the same data and nothing is downloaded.
+"""
+import numpy as np
+import pandas as pd
+
+
+def points(n, groups, seed=0):
+    """Uniform x/y points with a value and one of `groups` string labels each."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'x': rng.random(n),
+                         'y': rng.random(n),
+                         'group': rng.integers(0, groups, n).astype(str),
+                         'value': rng.random(n)})
+
+
+def series(n, groups, seed=0):
+    """`groups` random walks of n // groups points each, rows shuffled."""
+    rng = np.random.default_rng(seed)
+    per_group = max(n // groups, 1)
+    df = pd.DataFrame({'t': np.tile(np.arange(per_group), groups),
+                       'y': rng.standard_normal(per_group * groups).cumsum(),
+                       'group': np.repeat(np.arange(groups), per_group).astype(str)})
+    return df.sample(frac=1, random_state=seed)
+
+
+def wide_frame(n, groups, extra_columns=10, seed=0):
+    """x, y and an integer group next to columns no chart reads."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({f'extra_{ix}': rng.random(n) for ix in range(extra_columns)})
+    df['x'] = rng.random(n)
+    df['y'] = rng.random(n)
+    df['group'] = rng.integers(0, groups, n)
+    return df
+
+
+def numeric_frame(rows, columns, seed=0):
+    """`columns` correlated numeric columns and one string column."""
+    rng = np.random.default_rng(seed)
+    # a few latent factors, so clustering has structure to find
+    factors = rng.standard_normal((rows, 8))
+    loadings = rng.standard_normal((8, columns))
+    df = pd.DataFrame(factors @ loadings + rng.standard_normal((rows, columns)),
+                      columns=[f'col_{ix}' for ix in range(columns)])
+    df['segment'] = rng.integers(0, 5, rows).astype(str)
+    return df
+
+
+def claims(n, seed=0):
+    """Heavy-tailed positive amounts, like the claim values dist is used on."""
+    return np.random.default_rng(seed).lognormal(7, 1.2, n)
+
+
+def labelled_values(n, labels=200, categorical=False, seed=0):
+    """Values with repeating labels and some missing values, as pie gets them."""
+    rng = np.random.default_rng(seed)
+    # a few large labels and a long tail, so most fold into "Other"
+    weights = 1 / np.arange(1, labels + 1) ** 1.5
+    label = rng.choice([f'label_{ix}' for ix in range(labels)], n, p=weights / weights.sum())
+    df = pd.DataFrame({'label': label, 'value': rng.exponential(1, n)})
+    df.loc[::97, 'value'] = np.nan
+    if categorical:
+        df['label'] = df['label'].astype('category')
+    return df
+
+
+def grid_points(side, seed=0):
+    """A side x side grid flattened to shuffled x, y, z points."""
+    axis = np.linspace(-3, 3, side)
+    X, Y = np.meshgrid(axis, axis)
+    order = np.random.default_rng(seed).permutation(X.size)
+    x, y = X.ravel()[order], Y.ravel()[order]
+    return x, y, np.sin(x) * np.cos(y)
+
+
+def scattered_points(n, seed=0):
+    """n uniform x/y points off any grid, with a smooth z."""
+    rng = np.random.default_rng(seed)
+    x, y = rng.uniform(-3, 3, n), rng.uniform(-3, 3, n)
+    return x, y, np.sin(x) * np.cos(y)
@@ -0,0 +1,148 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+import atexit
+import io
+import itertools
+import os
+import pickle
+import queue
+import threading
+from datetime import datetime
+
+
+# +
+_COUNTER = itertools.count()
+_DIR_LOCK = threading.Lock()
+_CREATED_DIRS = set()
+
+
+def unique_path(directory, extension='png'):
+    """
+    A new file name in `directory` for an autosaved figure.
+    
+    Names keep the timestamp format autosave has always used, followed by the
+    process id and a per-process sequence number, so figures saved within the
+    same second (or by several worker processes) never overwrite each other.
+    The directory is created the first time it is used.
+    """
+    with _DIR_LOCK:
+        if directory not in _CREATED_DIRS:
+            os.makedirs(directory, exist_ok=True)
+            _CREATED_DIRS.add(directory)
+    stamp = datetime.now().strftime("%m-%d-%Y-%H:%M:%S")
+    return os.path.join(directory, f"{stamp}-{os.getpid()}-{next(_COUNTER):06d}.{extension}")
+
+
+def _blank(cls):
+    return cls.__new__(cls)
+
+
+class _DetachedPickler(pickle.Pickler):
+    # pickles a figure without the flag that re-registers it with pyplot on
+    # load, so the copy can be rendered off the main thread
+    
+    def __init__(self, file, figure):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.figure = figure
+    
+    def reducer_override(self, obj):
+        if obj is not self.figure:
+            return NotImplemented
+        state = obj.__getstate__()
+        state.pop('_restore_to_pylab', None)
+        return _blank, (type(obj),), state
+
+
+def snapshot(fig):
+    """Serialize `fig` as it is now, independent of later changes to it."""
+    buf = io.BytesIO()
+    _DetachedPickler(buf, fig).dump(fig)
+    return buf.getvalue()
+
+
+def _save_snapshot(payload, path, savefig_kwargs):
+    fig = pickle.loads(payload)
+    fig.savefig(path, **savefig_kwargs)
+
+
+class AutosaveWriter:
+    """
+    Writes figures on background threads fed by a bounded queue.
+    
+    `save_figure` snapshots the figure on the calling thread, which is cheap
+    compared with rendering, encoding and writing it, and returns straight
+    away unless `maxsize` saves are already waiting. Errors raised by a
+    save are re-raised by the next `flush`.
+    """
+    
+    def __init__(self, workers=2, maxsize=16):
+        self.workers = workers
+        self._queue = queue.Queue(maxsize)
+        self._threads = []
+        self._errors = []
+        self._lock = threading.Lock()
+    
+    def _start(self):
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name='customplotlib-autosave', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+    
+    def _work(self):
+        while True:
+            func, args = self._queue.get()
+            try:
+                func(*args)
+            except Exception as e:
+                self._errors.append(e)
+            finally:
+                self._queue.task_done()
+    
+    def submit(self, func, *args):
+        """Run `func(*args)` on a worker, blocking while the queue is full."""
+        self._start()
+        self._queue.put((func, args))
+    
+    def save_figure(self, fig, path, **savefig_kwargs):
+        self.submit(_save_snapshot, snapshot(fig), path, savefig_kwargs)
+    
+    def flush(self):
+        """Block until every queued save has been written."""
+        self._queue.join()
+        if self._errors:
+            errors, self._errors = self._errors, []
+            raise errors[0]
+
+
+_WRITER = None
+
+
+def get_writer():
+    """The process-wide AutosaveWriter, created on first use."""
+    global _WRITER
+    if _WRITER is None:
+        _WRITER = AutosaveWriter()
+    return _WRITER
+
+
+def flush():
+    """Block until every background autosave has been written."""
+    if _WRITER is not None:
+        _WRITER.flush()
+
+
+atexit.register(flush)
@@ -15,23 +15,163 @@
 # +
 import matplotlib.pyplot as pyplot
 from matplotlib import font_manager as fm
-from mpl_toolkits.mplot3d import Axes3D
 import matplotlib.font_manager as font_manager
 from matplotlib.font_manager import FontProperties
-from matplotlib.textpath import TextToPath
 from matplotlib.path import Path
-import plotly.graph_objects as go
-import seaborn as sns
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+from matplotlib import colors as matplotcolors
 from customplotlib.customization.config import *
 from customplotlib.customization import processing
-from cycler import cycler
-from datetime import datetime
+from customplotlib import autosave
+from customplotlib import columns
+from customplotlib import correlation
+from customplotlib import density
+from customplotlib import surface
+from customplotlib import kde
+from customplotlib import theme as theming
+from customplotlib import instrument as instrumenting
+from customplotlib import stream as streaming
+from customplotlib import chart as charting
+from customplotlib import cache as caching
+from customplotlib import pool as pooling
 import numpy as np
 import pandas as pd
+import functools
 import os
+import shutil
+import threading
 
 
 
+# fonts are registered with matplotlib's global font manager, so the scan and
+# parse only has to happen once per process no matter how many instances exist
+_FONT_LOCK = threading.Lock()
+_REGISTERED_FONT_PATHS = set()
+_FONT_PROPERTIES = {}
+
+
+def register_fonts(path):
+   """Register a .ttf file, or every font file in a directory, once per process."""
+   path = os.path.abspath(path)
+   with _FONT_LOCK:
+       if path in _REGISTERED_FONT_PATHS:
+           return
+       if os.path.isdir(path):
+           font_files = fm.findSystemFonts(fontpaths=[path])
+       else:
+           font_files = [path]
+       known = {f.fname for f in fm.fontManager.ttflist}
+       for font_file in font_files:
+           if font_file not in known:
+               fm.fontManager.addfont(font_file)
+       _REGISTERED_FONT_PATHS.add(path)
+
+
+def get_font(fname):
+   """Return the shared FontProperties for a font file, building it on first use."""
+   fname = os.path.abspath(fname)
+   with _FONT_LOCK:
+       if fname not in _FONT_PROPERTIES:
+           _FONT_PROPERTIES[fname] = fm.FontProperties(fname=fname)
+       return _FONT_PROPERTIES[fname]
+
+
+def resolve_color(color):
+   """Map an aliased color name from MAINS/SUPPS/OFFICIAL to its hex code."""
+   if isinstance(color, str):
+       return processing.COLOR_INDEX.get(color, color)
+   return color
+
+
+def is_column(data, name):
+   """True if `name` is a column of the `data=` argument."""
+   if data is None or not isinstance(name, str):
+       return False
+   try:
+       return name in data
+   except TypeError:
+       return False
+
+
+def pie_slices(df, label_col, val_col, other_threshold=0.1):
+   """
+   Slice labels and percentages for a pie chart of `val_col` by `label_col`.
+   
+   A label keeps its own slice if any of its rows holds at least
+   `other_threshold` of the total; the rest is folded into "Other". Slices
+   come in the order pie draws them: "Other" first, then by size. Missing
+   values count as 0 and `df` is not modified. Everything after a single
+   groupby works on one row per label.
+   """
+   vals = df[val_col].fillna(0)
+   total = vals.sum()
+   per_label = vals.groupby(df[label_col], observed=True, sort=False, dropna=False).agg(['sum', 'max'])
+   
+   keep = (per_label['max'] / total >= other_threshold).to_numpy()
+   kept = per_label[keep & per_label.index.notna()]['sum']
+   kept = kept.sort_values(ascending=False, kind='stable')
+   
+   slices = pd.concat([pd.Series({'Other': per_label['sum'][~keep].sum()}), kept])
+   # a kept label that is itself called "Other" shares the slice
+   slices = slices.groupby(level=0, sort=False).sum()
+   slices = slices[slices / total > 0]
+   return pd.Series(slices.index, name='slice_names'), (slices / total * 100).reset_index(drop=True)
+
+
+def themed(method):
+   """Run a plotting method inside the instance's theme when it is scoped."""
+   @functools.wraps(method)
+   def wrapper(self, *args, **kwargs):
+       if not self.scoped:
+           return method(self, *args, **kwargs)
+       with self.theme.context():
+           return method(self, *args, **kwargs)
+   return wrapper
+
+
+def instrumented(method):
+   """
+   Record a plotting call into the instance's instrumentation when it is on;
+   off, the only cost is one attribute check. Calls made from inside an
+   instrumented call are counted as part of the outer one.
+   """
+   name = method.__name__
+   @functools.wraps(method)
+   def wrapper(self, *args, **kwargs):
+       if self.instrumentation is None or self._record is not instrumenting.OFF:
+           return method(self, *args, **kwargs)
+       with self.instrumentation.call(name) as record:
+           self._record = record
+           try:
+               return method(self, *args, **kwargs)
+           finally:
+               self._record = instrumenting.OFF
+   return wrapper
+
+
+def cached(method):
+   """Serve a plotting call from the instance's render cache when it has one."""
+   @functools.wraps(method)
+   def wrapper(self, *args, **kwargs):
+       if self.cache is None:
+           return method(self, *args, **kwargs)
+       return self._cached_call(method, args, kwargs)
+   return wrapper
+
+
+def managed(method):
+   """Apply the instance's figure lifecycle policy once a plotting call is done."""
+   @functools.wraps(method)
+   def wrapper(self, *args, **kwargs):
+       result = method(self, *args, **kwargs)
+       if self.close_after_save or self.keep_last_n is not None:
+           self._record.phase('close')
+           self._retire(result)
+       return result
+   return wrapper
+
+
 def format_str(string):
    strings = string.split('_')
    strings = [s.lower().capitalize() for s in strings]
@@ -43,25 +183,27 @@ class Customplotlib():
                 official_colors=False,
                 color_blind_mode=False,
                 override_fontpath=False,
-                override_autosave=AUTOSAVE):
-      
-       for i in dir(pyplot):
-           if i not in ['scatter', 'plot', 'matshow', 'pie']:
-               setattr(self, i, getattr(pyplot, i))
-              
+                override_autosave=AUTOSAVE,
+                background_save=False,
+                scoped=False,
+                instrument=False,
+                profile=None,
+                cache=False,
+                cache_size=RENDER_CACHE_SIZE,
+                close_after_save=False,
+                keep_last_n=None,
+                pool=False):
       
        self.ROOT_DIR = ROOT_DIR
-       font_dirs = [os.path.abspath(ROOT_DIR)]
-       font_files = fm.findSystemFonts(fontpaths=font_dirs)
        if not override_fontpath:
-           for font_file in font_files:
-               fm.fontManager.addfont(font_file)
+           register_fonts(ROOT_DIR)
                       
            self.fontpath = ROOT_DIR + FONT
-           self.font = fm.FontProperties(fname=ROOT_DIR + FONT)
+           self.font = get_font(ROOT_DIR + FONT)
        else:
-           fm.fontManager.addfont(override_fontpath)
-           self.font = fm.FontProperties(fname=override_fontpath)
+           register_fonts(override_fontpath)
+           self.font = get_font(override_fontpath)
+       self.override_fontpath = override_fontpath
        self.fontsize = FONT_SIZE    
        self.titlesize = TITLE_SIZE
           
@@ -80,92 +222,331 @@ class Customplotlib():
        self.markersize = MARKERSIZE
        self.figsize = FIGSIZE
        self.autosave = override_autosave
+       self.background_save = background_save
        self.savepath = FIGSAVEPATH
        self.legend_loc = LEGEND_LOC       
       
-       if not self.color_blind_mode:
-           self.rcParams['axes.prop_cycle'] = cycler(color=self.colors)
-       else: 
-           self.rcParams['axes.prop_cycle'] = (cycler(linestyle=LINESTYLES[:len(self.colors)]) +
-                                               cycler(color=self.colors) +
-                                               cycler(marker=MARKERSTYLES[:len(self.colors)])
-                                              )
-      
-       self.rcParams['font.family'] = self.font.get_family()
-       self.rcParams['font.sans-serif'] = self.font.get_name()
-       self.rcParams["font.size"] = self.fontsize
-      
-       self.rcParams['text.color'] = "#3F3F3F"
-       self.rcParams['axes.labelcolor'] = "#3F3F3F"
-       self.rcParams['xtick.color'] = "#3F3F3F"
-       self.rcParams['ytick.color'] = "#3F3F3F"
-      
-       self.rcParams["axes.labelsize"] = self.fontsize
-       self.rcParams["axes.titlesize"] = self.titlesize
-       self.rcParams["axes.titleweight"] = 'bold'
-   
+       # compiled once per palette and font; scoped instances leave the
+       # global rcParams alone and apply their theme around each chart
+       self.scoped = scoped
+       self.theme = theming.compile_theme(tuple(self.colors),
+                                          bool(self.color_blind_mode),
+                                          tuple(self.font.get_family()),
+                                          self.font.get_name())
+       if not self.scoped:
+           self.theme.apply()
+          
+       # instrument=True records every plotting call into self.stats; a
+       # callable is also called with each CallRecord as it completes
+       self.instrumentation = None
+       self._record = instrumenting.OFF
+       if instrument or profile:
+           self.instrument(callback=instrument if callable(instrument) else None, profile=profile)
+          
+       # cache=True keeps renders under RENDER_CACHE_PATH, a string names
+       # another directory; see _cached_call
+       self.cache = None
+       if cache:
+           directory = RENDER_CACHE_PATH if cache is True else cache
+           self.cache = caching.get_cache(directory, cache_size)
+          
+       # close_after_save closes each chart's figure once it is autosaved,
+       # keep_last_n keeps only the figures of the last n charts open
+       self.close_after_save = close_after_save
+       self.keep_last_n = keep_last_n
+       self._figures = []
+          
+       # pool=True, a size or a pooling.FigurePool: figure(), and plot and
+       # scatter without a figure in use, take a reused figure from the pool,
+       # and close() hands it back
+       self.pool = None
+       if isinstance(pool, pooling.FigurePool):
+           self.pool = pool
+       elif pool:
+           self.pool = pooling.FigurePool(FIGURE_POOL_SIZE if pool is True else pool)
+  
+   def __getattr__(self, name):
+       # anything not defined here (legend, rcParams, title, ...) is looked up
+       # on pyplot at call time, so the wrapper always sees the live module
+       if name.startswith('__'):
+           raise AttributeError(name)
+       try:
+           return getattr(pyplot, name)
+       except AttributeError:
+           raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'") from None
+  
+   def __dir__(self):
+       return sorted(set(super().__dir__()) | set(dir(pyplot)))
+  
+   def _autosave(self, fig=None):
+       """
+       Save `fig` (the current figure by default) to a new file under
+       savepath if autosave is on, on a background thread when
+       background_save is set. Scoped instances render on this thread, where
+       their theme is active. Returns the path, or None.
+       """
+       if not self.autosave:
+           return None
+       fig = pyplot.gcf() if fig is None else fig
+       path = autosave.unique_path(self.savepath)
       
-       self.rcParams["figure.titlesize"] = self.titlesize
+       if hasattr(fig, 'write_image'):
+           # plotly figures
+           if self.background_save:
+               autosave.get_writer().submit(type(fig)(fig).write_image, path)
+           else:
+               fig.write_image(path)
+       elif self.background_save and not self.scoped:
+           autosave.get_writer().save_figure(fig, path, bbox_inches='tight')
+       else:
+           fig.savefig(path, bbox_inches='tight')
+       return path
+  
+   def _current_figure(self):
+       """The current pyplot figure, or None if there is none or it is idle in the pool."""
+       if not pyplot.get_fignums():
+           return None
+       fig = pyplot.gcf()
+       if self.pool is not None and self.pool.is_idle(fig):
+           return None
+       return fig
+  
+   def _axes(self):
+       """The axes plot and scatter draw on: the current ones, or a pooled figure's."""
+       if self.pool is not None and self._current_figure() is None:
+           return self.pool.acquire()[1]
+       return self.gca()
+  
+   def figure(self, *args, **kwargs):
+       """pyplot.figure, except that a plain figure() comes from the pool when there is one."""
+       if self.pool is not None and not args and not kwargs:
+           return self.pool.acquire()[0]
+       return pyplot.figure(*args, **kwargs)
+  
+   def close(self, fig=None):
+       """
+       Close `fig` (the current figure by default, 'all' for every one) like
+       pyplot.close, except that figures from the pool go back to it, and
+       close('all') leaves its idle figures open. A Chart on a figure handed
+       back must not be updated any more.
+       """
+       if self.pool is None or not (fig is None or fig == 'all' or isinstance(fig, pyplot.Figure)):
+           return pyplot.close(fig)
+       if fig == 'all':
+           figs = [pyplot.figure(num) for num in pyplot.get_fignums()]
+       elif fig is None:
+           figs = [pyplot.gcf()] if pyplot.get_fignums() else []
+       else:
+           figs = [fig]
+       for fig in figs:
+           if not (self.pool.release(fig) or self.pool.is_idle(fig)):
+               pyplot.close(fig)
+  
+   def _result_figure(self, result):
+       """The figure a plotting call drew on, going by what it returned."""
+       fig = getattr(result, 'figure', None)
+       if fig is None and pyplot.get_fignums():
+           fig = pyplot.gcf()
+       return fig
+  
+   def _retire(self, result):
+       """Close the figure a plotting call drew on, or older ones, as the policy asks."""
+       if hasattr(result, 'write_image'):
+           # plotly figures are not pyplot's to close
+           return
+       fig = self._result_figure(result)
+       if fig is None:
+           return
+       if self.close_after_save and self.autosave:
+           self.close(fig)
+           return
+       if self.keep_last_n is not None:
+           if fig in self._figures:
+               self._figures.remove(fig)
+           self._figures.append(fig)
+           while len(self._figures) > self.keep_last_n:
+               self.close(self._figures.pop(0))
+  
+   def instrument(self, callback=None, profile=None, keep=1000):
+       """
+       Start recording phase timings and input sizes of every plot, scatter,
+       matshow, three_d_plot, pie and dist call; see
+       customplotlib.instrument.Instrumentation for the options. Returns the
+       Stats the calls are recorded into. Set `instrumentation` to None to
+       stop.
+       """
+       self.instrumentation = instrumenting.Instrumentation(callback=callback, profile=profile, keep=keep)
+       return self.instrumentation.stats
+  
+   @property
+   def stats(self):
+       """The Stats of the recorded calls, or None when instrumentation is off."""
+       return None if self.instrumentation is None else self.instrumentation.stats
+  
+   def _cached_call(self, method, args, kwargs):
+       """
+       Run a plotting method, copying its autosave from the render cache.
+       Only calls that start a new figure are cached.
+       """
+       name = method.__name__
+       if not self.autosave or (name == 'pie' and kwargs.get('backend', 'plotly') == 'plotly'):
+           return method(self, *args, **kwargs)
+       self._record.phase('cache')
+       settings = (self.colors, bool(self.color_blind_mode), self.gradients, self.font.get_file())
+       if name in ('plot', 'scatter'):
+           current = self._current_figure()
+           if current is not None:
+               if current.axes:
+                   return method(self, *args, **kwargs)
+               settings += (tuple(current.get_size_inches()), current.dpi)
+       try:
+           key = caching.render_key(name, args, kwargs, settings)
+       except caching.Uncacheable:
+           return method(self, *args, **kwargs)
+       path = self.cache.get(key)
+      
+       self._record.phase('prepare')
+       self.autosave = False
+       try:
+           result = method(self, *args, **kwargs)
+       finally:
+           self.autosave = True
+      
+       self._record.phase('save')
+       copy = autosave.unique_path(self.savepath)
+       if path is not None:
+           try:
+               shutil.copyfile(path, copy)
+               return result
+           except FileNotFoundError:
+               # evicted by another process since the lookup
+               pass
+       self.cache.store(self._result_figure(result), key, [copy],
+                        autosave.get_writer() if self.background_save and not self.scoped else None)
+       return result
+  
+   def flush(self):
+       """Block until every background autosave has been written."""
+       autosave.flush()
+  
+   def render_batch(self, specs, workers=None, outdir=None, fmt='png', **kwargs):
+       """
+       Render many charts in parallel with this instance's palette and font
+       settings; see customplotlib.batch.render_batch for the spec format.
+       """
+       from customplotlib import batch
       
-       self.rcParams["figure.figsize"] = self.figsize
-       self.rcParams['lines.markersize'] = self.markersize
-       self.rcParams['lines.linewidth'] = 2
+       options = {'supp_colors': self.supp_colors,
+                  'official_colors': self.official_colors,
+                  'color_blind_mode': self.color_blind_mode,
+                  'override_fontpath': self.override_fontpath}
+       return batch.render_batch(specs, options, workers=workers, outdir=outdir, fmt=fmt, **kwargs)
   
+   @instrumented
+   @managed
+   @themed
+   @cached
    def plot(self, **kwargs):
       
-       color = kwargs.pop('color', None)
-       if color in list(MAINS.keys()):
-           color = MAINS[color]
-       elif color in list(SUPPS.keys()):
-           color = SUPPS[color]
-       elif color in list(OFFICIAL.keys()):
-           color = OFFICIAL[color]
+       color = resolve_color(kwargs.pop('color', None))
       
        title = kwargs.pop('title',False)
        xlabel = kwargs.pop('xlabel',False)
        ylabel = kwargs.pop('ylabel',False)
        label = kwargs.get('label', None)
-       legend = kwargs.get('legend', True)
-       legend_loc = kwargs.get('legend_loc', LEGEND_LOC)
+       legend = kwargs.pop('legend', True)
+       legend_loc = kwargs.pop('legend_loc', LEGEND_LOC)
+       collection = kwargs.pop('collection', False)
+       legend_max = kwargs.pop('legend_max', None)
+       downsample = kwargs.pop('downsample', None)
       
+       # column names to take new data from in Chart.update
+       names = (kwargs.get('x'), kwargs.get('y'), label)
+       ax = self._axes()
+       groups = None
+       handles = None
        if label is not None:
            if (type(kwargs.get('label')) == str) & ('data' in kwargs.keys()):
-               data_df = kwargs.pop('data').copy()
-
                input_x_name = kwargs.pop('x')
                input_y_name = kwargs.pop('y')
-
-               data_df['x'] = data_df[input_x_name]
-               data_df['y'] = data_df[input_y_name]
+               x, y, labels = columns.get_columns(kwargs.pop('data'), input_x_name,
+                                                  input_y_name, kwargs.pop('label'))
 
                xlabel = format_str(input_x_name) if not xlabel else xlabel
                ylabel = format_str(input_y_name) if not ylabel else ylabel
                title = ylabel + " by " + xlabel
-              
-               data_df.sort_values(by=kwargs.get('label'), inplace=True)
-               groups = data_df.groupby(kwargs.pop('label'), sort=True)
            else:
-              
-               data_df = pd.DataFrame({'x': kwargs.pop('x'),
-                                       'y': kwargs.pop('y'),
-                                       'label': kwargs.pop('label')})
-               data_df.sort_values(by='label', inplace=True)
-               groups = data_df.groupby('label', sort=True)
+               x = np.asarray(kwargs.pop('x'))
+               y = np.asarray(kwargs.pop('y'))
+               labels = columns.as_labels(kwargs.pop('label'), len(x))
           
-           for name, group in groups:
-               group.sort_values(by='x', inplace=True)
-               pyplot.plot(group.x, group.y, **kwargs, label=name, color=color)
+           self._record.size(rows=len(x))
+           self._record.phase('artists')
+           if collection:
+               groups = charting.LineSegments(ax, color, legend_max, downsample, self.colors, **kwargs)
+           else:
+               groups = charting.LineGroups(ax, color, downsample, **kwargs)
+           handles = groups(x, y, labels)
+           self._record.size(groups=len(groups.names))
 
        else:
            x = kwargs.pop('x', None)
            y = kwargs.pop('y', None)
-           pyplot.plot(x,y,**kwargs, color=color)
+           if 'data' in kwargs:
+               data = kwargs.pop('data')
+               x, y = (columns.get_column(data, v) if is_column(data, v) else v for v in (x, y))
+           if y is not None:
+               self._record.size(rows=len(y))
+           self._record.phase('artists')
+           if downsample and y is not None:
+               x = np.arange(len(y)) if x is None else np.asarray(x)
+               groups = charting.LineGroups(ax, color, downsample, **kwargs)
+               groups(x, np.asarray(y))
+           else:
+               lines = pyplot.plot(x,y,**kwargs, color=color)
+               if len(lines) == 1:
+                   groups = charting.LineGroups(ax, color, sort=False, **kwargs)
+                   groups.artists[None] = lines[0]
       
-       if legend:
+       self._record.phase('legend')
+       if legend and handles:
+           self.legend(handles=handles, bbox_to_anchor=legend_loc)
+       elif legend:
            handles, labels = self.gca().get_legend_handles_labels()
            if labels:
                self.legend(bbox_to_anchor=legend_loc)         
       
+       self._record.phase('labels')
+       if title:
+           self.title(title)
+      
+       if xlabel:
+           self.xlabel(xlabel)
+      
+       if ylabel:
+           self.ylabel(ylabel)
+      
+       self._record.phase('save')
+       self._autosave()
+      
+       return charting.Chart(self, ax, groups, names, label is not None, legend_loc if legend else None)
+          
+   @themed
+   def stream(self, window=10000, **kwargs):
+       """
+       Start a live line chart on the current axes and return its
+       customplotlib.stream.Stream; call append(x, y, label=...) on it as
+       data arrives. Each label keeps its last `window` points in a ring
+       buffer and its line is updated in place, redrawn with blitting.
+       Other keyword arguments are Line2D properties for every line.
+       """
+       title = kwargs.pop('title',False)
+       xlabel = kwargs.pop('xlabel',False)
+       ylabel = kwargs.pop('ylabel',False)
+       legend = kwargs.pop('legend', True)
+       legend_loc = kwargs.pop('legend_loc', LEGEND_LOC)
+      
+       ax = self.gca()
        if title:
            self.title(title)
       
@@ -175,72 +556,118 @@ class Customplotlib():
        if ylabel:
            self.ylabel(ylabel)
       
-       if self.autosave:
-           if not os.path.exists(FIGSAVEPATH):
-               os.makedirs(FIGSAVEPATH)           
-           pyplot.savefig(FIGSAVEPATH + datetime.now().strftime("%m-%d-%Y-%H:%M:%S.png"), bbox_inches='tight')
+       return streaming.Stream(ax, window, legend_loc if legend else None, **kwargs)
+  
+   def _numeric_xy(self, x, y):
+       # register units (e.g. dates) on the current axes and convert to floats
+       ax = self.gca()
+       return (ax,) + charting.numeric(ax, x, y)
           
+   @instrumented
+   @managed
+   @themed
+   @cached
    def scatter(self, *args, **kwargs):
       
        color = kwargs.pop('color', None)
-       if color in list(MAINS.keys()):
-           color = MAINS[color]
-       elif color in list(SUPPS.keys()):
-           color = SUPPS[color]
-       elif color in list(OFFICIAL.keys()):
-           color = OFFICIAL[color]
+       data = kwargs.get('data')
+       color_column = color if is_column(data, color) else None
+       color = resolve_color(color)
       
        title = kwargs.pop('title',False)
        xlabel = kwargs.pop('xlabel',False)
        ylabel = kwargs.pop('ylabel',False)
        label = kwargs.get('label', None)
-       legend = kwargs.get('legend', True)
-       legend_loc = kwargs.get('legend_loc', LEGEND_LOC)  
+       legend = kwargs.pop('legend', True)
+       legend_loc = kwargs.pop('legend_loc', LEGEND_LOC)  
+       collection = kwargs.pop('collection', False)
+       legend_max = kwargs.pop('legend_max', None)
+       render = kwargs.pop('render', None)
       
        if kwargs.pop('marker',False) == 'logo':
+           from matplotlib.textpath import TextToPath
            font_path = f"{ROOT_DIR}/AetnaCVSLogo.ttf"
            fp = FontProperties(fname=font_path)
            v, codes = TextToPath().get_text_path(fp, s='©')
            path = Path(v, codes, closed=False)
            kwargs['marker'] = path
       
-       if label is not None:
+       # column names to take new data from in Chart.update
+       names = (kwargs.get('x', args[0] if len(args) > 0 else None),
+                kwargs.get('y', args[1] if len(args) > 1 else None), label)
+       ax = self._axes()
+       groups = None
+       handles = None
+       if render == 'density':
+           data = kwargs.pop('data', None)
+           x = kwargs.pop('x', args[0] if len(args) > 0 else None)
+           y = kwargs.pop('y', args[1] if len(args) > 1 else None)
+           if is_column(data, x) and is_column(data, y):
+               xlabel = format_str(x) if not xlabel else xlabel
+               ylabel = format_str(y) if not ylabel else ylabel
+           x, y, labels, values = (columns.get_column(data, v) if is_column(data, v) else v
+                                   for v in (x, y, kwargs.pop('label', None), kwargs.pop('values', None)))
+           self._record.size(rows=len(x))
+           self._record.phase('artists')
+           handles = self._scatter_density(x, y, labels, values, color, **kwargs)
+          
+       elif render is not None:
+           raise ValueError(f"render must be None or 'density', not {render!r}")
+          
+       elif color_column is not None:
+           if label is not None:
+               raise ValueError("color= a column of data cannot be combined with label=")
+           gradient = kwargs.pop('gradient', 'joe_green')
+           color, handles = self._column_colors(columns.get_column(data, color_column), gradient)
+           self._record.size(rows=len(color))
+           self._record.phase('artists')
+           if handles is None:
+               kwargs['cmap'] = processing.get_gradient(self.gradients[gradient], name=gradient)
+           pyplot.scatter(*args, **kwargs, c=color)
+          
+       elif label is not None:
            if (type(kwargs.get('label')) == str) & ('data' in kwargs.keys()):
-               data_df = kwargs.pop('data').copy()
                input_x_name = kwargs.pop('x')
                input_y_name = kwargs.pop('y')
-
-               data_df['x'] = data_df[input_x_name]
-               data_df['y'] = data_df[input_y_name]
+               x, y, labels = columns.get_columns(kwargs.pop('data'), input_x_name,
+                                                  input_y_name, kwargs.pop('label'))
 
                xlabel = format_str(input_x_name) if not xlabel else xlabel
                ylabel = format_str(input_y_name) if not ylabel else ylabel
                title = ylabel + " by " + xlabel
-              
-               data_df.sort_values(by=kwargs.get('label'), inplace=True)
-               groups = data_df.groupby(kwargs.pop('label'), sort=True)
            else:
-               data_df = pd.DataFrame({'x': kwargs.pop('x'),
-                                       'y': kwargs.pop('y'),
-                                       'label': kwargs.pop('label')})
-               data_df.sort_values(by='label', inplace=True)
-               groups = data_df.groupby('label', sort=True)
+               x = np.asarray(kwargs.pop('x'))
+               y = np.asarray(kwargs.pop('y'))
+               labels = columns.as_labels(kwargs.pop('label'), len(x))
           
-           for name, group in groups:
-              
+           self._record.size(rows=len(x))
+           self._record.phase('artists')
+           if collection:
+               groups = charting.MarkerStyles(ax, color, legend_max, self.color_blind_mode, self.colors,
+                                              *args, **kwargs)
+           else:
+               markers = None
                if self.color_blind_mode:
-                   kwargs['marker'] = next(self.gca()._get_lines.prop_cycler)['marker']
-              
-               pyplot.scatter(*args, **kwargs, x=group.x, y=group.y, label=name, color=color)
+                   markers = pyplot.rcParams['axes.prop_cycle'].by_key().get('marker')
+               groups = charting.MarkerGroups(ax, color, markers, *args, **kwargs)
+           handles = groups(x, y, labels)
+           self._record.size(groups=len(groups.names))
 
        else:
-           pyplot.scatter(*args, **kwargs, color=color)
+           self._record.phase('artists')
+           markers = pyplot.scatter(*args, **kwargs, color=color)
+           groups = charting.MarkerGroups(ax, color, None, *args, **kwargs)
+           groups.artists[None] = markers
       
-       if legend:
+       self._record.phase('legend')
+       if legend and handles:
+           self.legend(handles=handles, bbox_to_anchor=legend_loc)
+       elif legend:
            handles, labels = self.gca().get_legend_handles_labels()
            if labels:
                self.legend(bbox_to_anchor=legend_loc)         
       
+       self._record.phase('labels')
        if title:
            self.title(title)
       
@@ -250,33 +677,143 @@ class Customplotlib():
        if ylabel:
            self.ylabel(ylabel)
       
-       if self.autosave:
-           if not os.path.exists(FIGSAVEPATH):
-               os.makedirs(FIGSAVEPATH)
-           pyplot.savefig(FIGSAVEPATH + datetime.now().strftime("%m-%d-%Y-%H:%M:%S.png"), bbox_inches='tight')
+       self._record.phase('save')
+       self._autosave()
+      
+       return charting.Chart(self, ax, groups, names, label is not None, legend_loc if legend else None)
           
+   def _scatter_density(self, x, y, labels=None, values=None, color=None,
+                        reduce=None, gradient='joe_green', **kwargs):
+       """
+       Draw points as a 2D histogram with one cell per pixel of the axes.
+      
+       Without labels the grid is shown through the `gradient` colormap;
+       `reduce` is 'count' (the default without `values`), 'sum' or 'mean'
+       (the default with `values`) of `values` per cell. Empty cells are
+       transparent. With labels each group gets its own layer in its palette
+       color, with opacity following the group's reduced grid, and the
+       legend gets one proxy handle per group. Returns the legend handles.
+       Cost depends on the number of pixels rather than points once binned.
+       """
+       ax, x, y = self._numeric_xy(x, y)
+       values = None if values is None else np.asarray(values, dtype=float)
+       reduce = reduce or ('count' if values is None else 'mean')
+      
+       bbox = ax.get_window_extent()
+       shape = (int(round(bbox.width)), int(round(bbox.height)))
+       extent = density.data_extent(x, y)
+       kwargs.setdefault('interpolation', 'nearest')
+       kwargs.setdefault('aspect', 'auto')
+      
+       if labels is None:
+           grid = density.bin2d(x, y, shape, extent, values, reduce)
+           if reduce != 'mean':
+               grid = np.ma.masked_equal(grid, 0)
+           cmap = processing.get_gradient(self.gradients[gradient], name=gradient)
+           image = ax.imshow(np.ma.masked_invalid(grid), extent=extent, origin='lower', cmap=cmap, **kwargs)
+           pyplot.sci(image)
+           return None
+      
+       names, groups = columns.group_indices(labels)
+       self._record.size(groups=len(names))
+       palette = pyplot.rcParams['axes.prop_cycle'].by_key().get('color', self.colors)
+       handles = []
+       for ix, (name, group) in enumerate(zip(names, groups)):
+           grid = density.bin2d(x[group], y[group], shape, extent,
+                                None if values is None else values[group], reduce)
+           grid = np.nan_to_num(grid)
+           peak = np.abs(grid).max()
+           layer_color = palette[ix % len(palette)] if color is None else color
+           rgba = np.empty(grid.shape + (4,))
+           rgba[..., :3] = matplotcolors.to_rgb(layer_color)
+           rgba[..., 3] = np.abs(grid) / peak if peak else 0
+           ax.imshow(rgba, extent=extent, origin='lower', **kwargs)
+           handles.append(Patch(color=layer_color, label=name))
+       return handles
           
-   def matshow(self, *args, **kwargs):
+   def _column_colors(self, values, gradient):
+       """
+       Per-point colors for a data column, in one vectorized pass.
       
+       Numeric columns are returned as-is to be mapped through the
+       `gradient` colormap, with no legend handles. Anything else is treated
+       as categorical: categories are factorized once and assigned the active
+       palette in sorted order, with one legend handle per category.
+       """
+       if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+           return np.asarray(values), None
+      
+       codes, uniques = pd.factorize(values, sort=True)
+       palette = processing.get_rgb_colors(self.colors, dtype=float)
+       colors = palette[codes % len(palette)]
+       colors[codes < 0] = processing.get_rgb_colors(['light-gray'], dtype=float)[0]
+      
+       handles = [Line2D([], [], linestyle='', marker='o', label=name,
+                         color=palette[ix % len(palette)])
+                  for ix, name in enumerate(uniques)]
+       return colors, handles
+          
+   @instrumented
+   @managed
+   @themed
+   @cached
+   def matshow(self, *args, **kwargs):
+       """
+       Show a matrix, labelled with the numeric columns when it is a DataFrame.
+       
+       With corr='pearson' or 'spearman', the first argument is raw data and
+       the matrix shown is the correlation of its numeric columns. With
+       cluster=True, rows and columns of a square matrix are reordered so
+       correlated columns sit together (needs scipy). Tick labels are thinned
+       to what fits on the axes, or to max_ticks.
+       """
        title = kwargs.pop('title',False)
        xlabel = kwargs.pop('xlabel',False)
        ylabel = kwargs.pop('ylabel',False) 
        xtick_rot = kwargs.pop('xtick_rot',45)
+       corr = kwargs.pop('corr', None)
+       cluster = kwargs.pop('cluster', False)
+       max_ticks = kwargs.pop('max_ticks', None)
+       workers = kwargs.pop('workers', None)
       
-       gradient = self.gradients[kwargs.pop('gradient', 'hot_cold')]
+       gradient = kwargs.pop('gradient', 'hot_cold')
+       cmap = processing.get_gradient(self.gradients[gradient],
+                                      invert=kwargs.pop('invert', False),
+                                      name=gradient)
       
-       if kwargs.pop('invert', False):
-               gradient.reverse()
-              
-       cmap = processing.get_gradient(gradient)
+       df = args[0]
+       names = None
+       if isinstance(df, pd.DataFrame):
+           names, matrix = correlation.numeric(df)
+       else:
+           matrix = np.asarray(df)
+       self._record.size(rows=matrix.shape[0], columns=matrix.shape[1])
       
-       pyplot.matshow(*args, **kwargs, cmap=cmap)
+       if corr:
+           self._record.phase('correlation')
+           matrix = correlation.correlation(matrix, method=corr, workers=workers)
+           kwargs.setdefault('vmin', -1)
+           kwargs.setdefault('vmax', 1)
       
-       df = args[0]
+       if cluster:
+           if matrix.shape[0] != matrix.shape[1]:
+               raise ValueError("cluster=True needs a square matrix, or corr=")
+           self._record.phase('cluster')
+           order = correlation.cluster_order(matrix)
+           matrix = matrix[np.ix_(order, order)]
+           if names is not None:
+               names = names[order]
       
-       self.xticks(range(df.select_dtypes(['number']).shape[1]), df.select_dtypes(['number']).columns, rotation=xtick_rot)
-       self.yticks(range(df.select_dtypes(['number']).shape[1]), df.select_dtypes(['number']).columns)
+       self._record.phase('artists')
+       pyplot.matshow(matrix, *args[1:], **kwargs, cmap=cmap)
       
+       if names is not None:
+           self._record.phase('ticks')
+           ticks = self._matrix_ticks(pyplot.gca(), len(names), max_ticks)
+           self.xticks(ticks, names[ticks], rotation=xtick_rot)
+           self.yticks(ticks, names[ticks])
+      
+       self._record.phase('labels')
        cb = self.colorbar()
 
        if title:
@@ -288,14 +825,33 @@ class Customplotlib():
        if ylabel:
            self.ylabel(ylabel)
       
-       if self.autosave:
-           if not os.path.exists(FIGSAVEPATH):
-               os.makedirs(FIGSAVEPATH)
-           pyplot.savefig(FIGSAVEPATH + datetime.now().strftime("%m-%d-%Y-%H:%M:%S.png"), bbox_inches='tight')  
+       self._record.phase('save')
+       self._autosave()
+      
+   def _matrix_ticks(self, ax, count, max_ticks=None):
+       """Every k-th position, with k the smallest step whose labels fit on the axes."""
+       if max_ticks is None:
+           ax.apply_aspect()
+           box = ax.get_window_extent()
+           size = FontProperties(size=pyplot.rcParams['ytick.labelsize']).get_size_in_points()
+           # a label needs about 1.5 line heights to stay readable
+           max_ticks = int(min(box.width, box.height) // (1.5 * size * ax.figure.dpi / 72))
+       step = -(-count // max(max_ticks, 1))
+       return np.arange(0, count, step)
           
+   @instrumented
+   @managed
+   @themed
+   @cached
    def three_d_plot(self, *args, **kwargs):
-      
-      
+       """
+       3D surface of z over the x/y points.
+       
+       Points on a complete grid, or 2-D meshgrid arrays, are drawn with
+       plot_surface, every `stride`-th row and column (default 1). Scattered
+       points are triangulated, and the triangulation is cached for repeat
+       plots over the same x/y.
+       """
        assert (len(args) >= 3)
       
        title = kwargs.pop('title',False)
@@ -303,20 +859,35 @@ class Customplotlib():
        ylabel = kwargs.pop('ylabel',False) 
       
       
-       gradient = self.gradients[kwargs.pop('gradient', 'rainbow')]
-       if kwargs.pop('invert', False):
-               gradient.reverse()
-       cmap = processing.get_gradient(gradient)
+       gradient = kwargs.pop('gradient', 'rainbow')
+       cmap = processing.get_gradient(self.gradients[gradient],
+                                      invert=kwargs.pop('invert', False),
+                                      name=gradient)
+      
+       stride = kwargs.pop('stride', None)
       
        x = args[0]
        y = args[1]
        z = args[2]
+       self._record.size(rows=np.size(z))
       
+       self._record.phase('artists')
        fig = pyplot.figure()
-       ax = Axes3D(fig)
-       surf = ax.plot_trisurf(x, y, z,
-                              cmap=cmap,
-                              linewidth=0.1)
+       ax = fig.add_subplot(projection='3d')
+       grid = surface.as_grid(x, y, z)
+       if grid is not None:
+           rstride, cstride = surface.strides(grid[2].shape, stride)
+           surf = ax.plot_surface(*grid,
+                                  cmap=cmap,
+                                  linewidth=0.1,
+                                  rstride=rstride,
+                                  cstride=cstride)
+       else:
+           surf = ax.plot_trisurf(surface.triangulation(x, y), np.asarray(z, dtype=float).ravel(),
+                                  cmap=cmap,
+                                  linewidth=0.1)
+      
+       self._record.phase('labels')
        fig.colorbar(surf, shrink=0.5, aspect=5)
 
        if title:
@@ -328,40 +899,47 @@ class Customplotlib():
        if ylabel:
            self.ylabel(ylabel)
       
-       if self.autosave:
-           if not os.path.exists(FIGSAVEPATH):
-               os.makedirs(FIGSAVEPATH)
-           pyplot.savefig(FIGSAVEPATH + datetime.now().strftime("%m-%d-%Y-%H:%M:%S.png"), bbox_inches='tight')
+       self._record.phase('save')
+       self._autosave()
           
           
+   @instrumented
+   @managed
+   @themed
+   @cached
    def pie(self, df, label_col, val_col, **kwargs):
-      
+       """
+       Pie chart of `val_col` summed by `label_col`, small labels folded into "Other".
+       
+       backend='plotly' (default) builds, autosaves and shows a plotly figure.
+       backend='matplotlib' draws the same chart with pyplot.pie, so it saves
+       through Agg like the other methods (background_save included) and
+       needs no Kaleido.
+       """
        title = kwargs.pop('title',False)      
        other_threshold = kwargs.pop('other_threshold',0.1)
        pixels = kwargs.pop('pixels', 400)
+       show = kwargs.pop('show', True)
+       backend = kwargs.pop('backend', 'plotly')
+       if backend not in ('plotly', 'matplotlib'):
+           raise ValueError(f"backend must be 'plotly' or 'matplotlib', not {backend!r}")
       
-       df[val_col].fillna(0, inplace=True)
-       df[f'{val_col}_norm'] = df[val_col] / df[val_col].sum()
-       sub_df = df.sort_values(by=f'{val_col}_norm', ascending=False)[[label_col, f'{val_col}_norm']]
-       to_keep = sub_df[sub_df[f'{val_col}_norm'] >= other_threshold][label_col].unique()
+       self._record.size(rows=len(df))
+       labels, values = pie_slices(df, label_col, val_col, other_threshold)
+       self._record.size(groups=len(labels))
+       self._record.phase('artists')
 
-       sub_df['slice_names'] = np.where(sub_df[label_col].isin(to_keep),
-                                        sub_df[label_col],
-                                        'Other')
-
-       to_plot = sub_df.groupby('slice_names')[f'{val_col}_norm'].sum().reset_index()
-
-       to_plot['rank'] = np.where(to_plot['slice_names'] == 'Other',
-                                  1,
-                                  0)
+       if not title:
+           title = label_col.capitalize()
+      
+       if backend == 'matplotlib':
+           fig = self._matplotlib_pie(labels, values, title, pixels)
+           self._record.phase('save')
+           self._autosave(fig)
+           return fig
+      
+       import plotly.graph_objects as go
       
-       to_plot.sort_values(by=['rank', f'{val_col}_norm'], ascending=False, inplace=True)
-       to_plot = to_plot[to_plot[f'{val_col}_norm'] > 0]
-
-       values = to_plot[f'{val_col}_norm'] * 100
-       labels = to_plot['slice_names']
-       lookup = dict(zip(values, labels))
-
        fig = go.Figure()
 
        # Add a pie chart trace
@@ -374,15 +952,12 @@ class Customplotlib():
                    rotation=0,
                    direction="clockwise",
                    textposition='outside',
-                   titlefont=dict(size =20, color="#3F3F3F", family='Helvetica'),
+                   title=dict(font=dict(size =20, color="#3F3F3F", family='Helvetica')),
                    textfont=dict(size =14, color="#3F3F3F", family='Helvetica'),
                    marker = {"line": {"width": 3, "color": 'white'}}
                  )
        )
 
-       if not title:
-           title = label_col.capitalize()
-      
        fig.update_layout(
            height=pixels,
            width=pixels,
@@ -396,15 +971,49 @@ class Customplotlib():
        )
       
 
-       if self.autosave:
-           if not os.path.exists(FIGSAVEPATH):
-               os.makedirs(FIGSAVEPATH)
-           fig.write_image(FIGSAVEPATH + datetime.now().strftime("%m-%d-%Y-%H:%M:%S.png"))  
-       fig.show()
+       self._record.phase('save')
+       self._autosave(fig)
+       if show:
+           self._record.phase('show')
+           fig.show()
+       return fig
       
+   def _matplotlib_pie(self, labels, values, title, pixels):
+       """The plotly pie layout drawn with pyplot.pie on a `pixels`-square figure."""
+       dpi = pyplot.rcParams['figure.dpi']
+       fig = pyplot.figure(figsize=(pixels / dpi, pixels / dpi))
+       ax = fig.add_subplot()
+       
+       percents = values / values.sum() * 100
+       text = [f"{label}\n{percent:.0f}%" for label, percent in zip(labels, percents)]
+       font = dict(size=14, color="#3F3F3F", multialignment='center')
+       # plotly: first slice at 12 o'clock, clockwise, 3px white borders
+       ax.pie(values,
+              labels=text,
+              colors=[self.colors[ix % len(self.colors)] for ix in range(len(values))],
+              startangle=90,
+              counterclock=False,
+              labeldistance=1.12,
+              wedgeprops=dict(edgecolor='white', linewidth=3 * 72 / dpi),
+              textprops=font)
+       ax.set_aspect('equal')
+       ax.set_title(title, fontsize=20, fontweight='bold', color="#3F3F3F")
+       return fig
       
-   def dist(self, x, **kwargs):
       
+   @instrumented
+   @managed
+   @themed
+   @cached
+   def dist(self, x, **kwargs):
+       """
+       Kernel density plot of `x`.
+       
+       engine='seaborn' (default) draws with sns.kdeplot. engine='fft' uses the
+       binned FFT estimator in customplotlib.kde, which stays fast for tens of
+       millions of values and takes bw_method, bw_adjust, weights, gridsize,
+       cut, clip and color like kdeplot does.
+       """
        title = kwargs.pop('title',False)
        xlabel = kwargs.pop('xlabel',False)
        ylabel = kwargs.pop('ylabel',False) 
@@ -415,8 +1024,17 @@ class Customplotlib():
        if not ax:
            fig,ax = pyplot.subplots(1,1)
       
-       vals = pd.Series(x)
-       sns.kdeplot(data = vals, ax=ax, fill=fill, **kwargs)
+       engine = kwargs.pop('engine', 'seaborn')
+       self._record.size(rows=np.size(x))
+       if engine == 'fft':
+           self._fft_kdeplot(x, ax, fill, **kwargs)
+       elif engine == 'seaborn':
+           import seaborn as sns
+           self._record.phase('artists')
+           vals = pd.Series(x)
+           sns.kdeplot(data = vals, ax=ax, fill=fill, **kwargs)
+       else:
+           raise ValueError(f"engine must be 'seaborn' or 'fft', not {engine!r}")
        ax.spines['top'].set_visible(False)
        ax.spines['right'].set_visible(False)
        ax.spines['left'].set_visible(False)
@@ -424,6 +1042,7 @@ class Customplotlib():
        ax.set_ylabel("")
        ax.tick_params(labelbottom=True)
       
+       self._record.phase('labels')
        if title:
            self.title(title)
       
@@ -433,10 +1052,28 @@ class Customplotlib():
        if ylabel:
            self.ylabel(ylabel)
       
-       if self.autosave:
-           if not os.path.exists(FIGSAVEPATH):
-               os.makedirs(FIGSAVEPATH)
-           pyplot.savefig(FIGSAVEPATH + datetime.now().strftime("%m-%d-%Y-%H:%M:%S.png"), bbox_inches='tight')
+       self._record.phase('save')
+       self._autosave()
           
        return ax
+
+   def _fft_kdeplot(self, x, ax, fill, **kwargs):
+       """Draw a kde.fft_kde curve the way sns.kdeplot draws a single series."""
+       estimate = {key: kwargs.pop(key) for key in ('weights', 'bw_method', 'bw_adjust', 'gridsize', 'cut', 'clip', 'bins') if key in kwargs}
+       self._record.phase('density')
+       support, curve = kde.fft_kde(x, **estimate)
+       self._record.phase('artists')
+       
+       color = kwargs.pop('color', None)
+       color = resolve_color(color) if color is not None else ax._get_lines.get_next_color()
+       if fill:
+           artist = ax.fill_between(support, curve, facecolor=matplotcolors.to_rgba(color, 0.25), edgecolor=color, **kwargs)
+       else:
+           artist, = ax.plot(support, curve, color=color, **kwargs)
+       # like seaborn, let the density axis start at zero without a margin
+       artist.sticky_edges.y[:] = (0, np.inf)
+       ax.autoscale_view()
+       if getattr(x, 'name', None) is not None and not ax.get_xlabel():
+           ax.set_xlabel(str(x.name))
+       return artist
    
\ No newline at end of file
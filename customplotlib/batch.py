@@ -0,0 +1,100 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+# +
+METHODS = ('plot', 'scatter', 'matshow', 'three_d_plot', 'dist', 'pie')
+
+# the Customplotlib each worker process renders with, built once per worker
+_WORKER = None
+
+
+def _init_worker(options):
+    global _WORKER
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    from customplotlib.base import Customplotlib
+    _WORKER = Customplotlib(**options, override_autosave=False)
+
+
+def _render(job):
+    index, spec, outdir, fmt, savefig_kwargs = job
+    from matplotlib import pyplot
+    
+    method = spec['method']
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, not {method!r}")
+    path = spec.get('path')
+    if path is None and outdir is not None:
+        path = os.path.join(outdir, f"{index:06d}.{fmt}")
+    
+    pyplot.figure()
+    try:
+        kwargs = dict(spec.get('kwargs', {}))
+        if method == 'pie':
+            kwargs.setdefault('show', False)
+        result = getattr(_WORKER, method)(*spec.get('args', ()), **kwargs)
+        
+        if hasattr(result, 'write_image'):
+            # plotly figure from pie
+            if path is None:
+                return result.to_image(format=fmt)
+            result.write_image(path)
+            return path
+        
+        fig = pyplot.gcf()
+        if path is None:
+            buf = io.BytesIO()
+            fig.savefig(buf, format=fmt, **savefig_kwargs)
+            return buf.getvalue()
+        fig.savefig(path, **savefig_kwargs)
+        return path
+    finally:
+        pyplot.close('all')
+
+
+def render_batch(specs, options=None, workers=None, outdir=None, fmt='png',
+                 mp_context=None, **savefig_kwargs):
+    """
+    Render many charts on a pool of worker processes.
+    
+    Each spec is a dict with the plotting `method` to call ('plot',
+    'scatter', 'matshow', 'three_d_plot', 'dist' or 'pie'), and optionally
+    its positional `args`, its `kwargs` and an output `path`. Every worker
+    uses the Agg backend and builds one Customplotlib from `options` (the
+    constructor arguments), so fonts, rcParams and palettes are set up once
+    per process rather than once per chart.
+    
+    Returns one result per spec, in order: the file written, or the encoded
+    image bytes when the spec has no path and no `outdir` is given. Files in
+    `outdir` are named after the spec's position. Spec arguments must be
+    picklable.
+    """
+    specs = list(specs)
+    options = dict(options or {})
+    workers = workers or os.cpu_count() or 1
+    savefig_kwargs.setdefault('bbox_inches', 'tight')
+    if outdir is not None:
+        os.makedirs(outdir, exist_ok=True)
+    
+    jobs = [(index, spec, outdir, fmt, savefig_kwargs) for index, spec in enumerate(specs)]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                             initializer=_init_worker, initargs=(options,)) as pool:
+        return list(pool.map(_render, jobs, chunksize=chunksize))
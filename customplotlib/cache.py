@@ -0,0 +1,242 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+import datetime
+import hashlib
+import os
+import pickle
+import shutil
+import threading
+from collections import OrderedDict
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+import customplotlib
+from customplotlib import autosave
+
+
+# +
+class Uncacheable(TypeError):
+    """An argument the render key cannot be computed from."""
+
+
+def _feed(h, obj):
+    """Add `obj` to the blake2b hash `h`, tagged with its type."""
+    h.update(type(obj).__name__.encode())
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes, np.generic,
+                                       datetime.date, datetime.timedelta)):
+        h.update(repr(obj).encode())
+    elif isinstance(obj, np.ndarray):
+        h.update(f"{obj.dtype.str}{obj.shape}".encode())
+        if obj.dtype.hasobject:
+            h.update(pd.util.hash_array(obj.ravel()).data)
+        else:
+            h.update(np.ascontiguousarray(obj).data)
+    elif isinstance(obj, pd.DataFrame):
+        _feed(h, obj.index)
+        for name in obj.columns:
+            _feed(h, name)
+            _feed(h, obj[name])
+    elif isinstance(obj, pd.Series):
+        _feed(h, obj.name)
+        _feed(h, obj.index)
+        if isinstance(obj.dtype, np.dtype):
+            _feed(h, obj.to_numpy())
+        else:
+            h.update(str(obj.dtype).encode())
+            h.update(pd.util.hash_pandas_object(obj, index=False).to_numpy().data)
+    elif isinstance(obj, pd.RangeIndex):
+        h.update(f"{obj.start}:{obj.stop}:{obj.step}".encode())
+    elif isinstance(obj, pd.Index):
+        _feed(h, obj.name)
+        h.update(pd.util.hash_array(np.asarray(obj)).data)
+    elif isinstance(obj, (list, tuple)):
+        h.update(str(len(obj)).encode())
+        for item in obj:
+            _feed(h, item)
+    elif isinstance(obj, dict):
+        h.update(str(len(obj)).encode())
+        for key in sorted(obj, key=repr):
+            _feed(h, key)
+            _feed(h, obj[key])
+    else:
+        raise Uncacheable(f"cannot key a render on a {type(obj).__name__}")
+
+
+def digest(*parts):
+    """Hex blake2b digest of `parts`; raises Uncacheable for unsupported types."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _feed(h, part)
+    return h.hexdigest()
+
+
+_RC_LOCK = threading.Lock()
+_RC_MEMO = (None, None)
+
+
+def rc_digest():
+    """Digest of the live rcParams, recomputed only when they changed."""
+    global _RC_MEMO
+    rc = dict(dict.items(matplotlib.rcParams))
+    with _RC_LOCK:
+        snapshot, value = _RC_MEMO
+        if snapshot != rc:
+            value = hashlib.blake2b(repr(list(rc.items())).encode(), digest_size=16).hexdigest()
+            _RC_MEMO = (rc, value)
+        return value
+
+
+def render_key(method, args, kwargs, settings):
+    """
+    Key of one plotting call: the method, its arguments (arrays and frames
+    by content), the instance `settings`, the active rcParams and the
+    library versions.
+    """
+    return digest(customplotlib.__version__, matplotlib.__version__, rc_digest(),
+                  method, args, kwargs, settings)
+
+
+def _store_snapshot(cache, payload, key, copies):
+    cache.write(pickle.loads(payload), key, copies)
+
+
+class RenderCache:
+    """
+    Rendered PNGs on disk under `directory`, one per render key.
+
+    Entries are evicted least recently used first once together they take
+    more than `max_bytes`. Recency survives restarts through the files'
+    modification times, which a hit refreshes. `hits`, `misses`, `stores`
+    and `evictions` count what happened since the cache was opened.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.png') and entry.is_file():
+                stat = entry.stat()
+                found.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._bytes += size
+        self._evict()
+
+    def __repr__(self):
+        return (f"RenderCache({self.directory!r}, {len(self._entries)} entries, "
+                f"{self.hits} hits, {self.misses} misses)")
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.png")
+
+    def get(self, key):
+        """The PNG path stored for `key`, or None; counts a hit or a miss."""
+        path = self.path(key)
+        with self._lock:
+            if key in self._entries:
+                try:
+                    os.utime(path)
+                except FileNotFoundError:
+                    # evicted by another process sharing the directory
+                    self._bytes -= self._entries.pop(key)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return path
+            self.misses += 1
+            return None
+
+    def write(self, fig, key, copies=()):
+        """Render `fig` into the entry for `key`, then copy it to each of `copies`."""
+        path = self.path(key)
+        tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        fig.savefig(tmp, format='png', bbox_inches='tight')
+        os.replace(tmp, path)
+        size = os.path.getsize(path)
+        for copy in copies:
+            shutil.copyfile(path, copy)
+        with self._lock:
+            self._bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self.stores += 1
+            self._evict()
+
+    def store(self, fig, key, copies=(), writer=None):
+        """write() now, or on the autosave `writer`'s threads from a snapshot of `fig`."""
+        if writer is None:
+            self.write(fig, key, copies)
+        else:
+            writer.submit(_store_snapshot, self, autosave.snapshot(fig), key, tuple(copies))
+
+    def _evict(self):
+        # the newest entry always stays, however large
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """Delete every entry."""
+        with self._lock:
+            for key in self._entries:
+                try:
+                    os.remove(self.path(key))
+                except FileNotFoundError:
+                    pass
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'stores': self.stores,
+                'evictions': self.evictions, 'entries': len(self._entries), 'bytes': self._bytes}
+
+
+_CACHES = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_cache(directory, max_bytes):
+    """The RenderCache for `directory`, shared by every instance in the process."""
+    directory = os.path.abspath(directory)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(directory)
+        if cache is None:
+            cache = _CACHES[directory] = RenderCache(directory, max_bytes)
+        else:
+            cache.max_bytes = max_bytes
+        return cache
@@ -0,0 +1,427 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+import numpy as np
+import pandas as pd
+import matplotlib
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+
+from customplotlib import columns
+from customplotlib import downsample as downsampling
+
+
+# +
+def numeric(ax, x, y):
+    """Register the units of x and y (e.g. dates) on `ax` and convert them to floats."""
+    ax.xaxis.update_units(x)
+    ax.yaxis.update_units(y)
+    x = np.asarray(ax.convert_xunits(np.asarray(x)), dtype=float)
+    y = np.asarray(ax.convert_yunits(np.asarray(y)), dtype=float)
+    return x, y
+
+
+def align(labels, names):
+    """
+    Codes of `labels` in the known `names`, with labels not seen before
+    added after them in sorted order. Missing labels get -1, as they do
+    from pd.factorize. Returns `(codes, names)`.
+    """
+    names = pd.Index(names, dtype=object)
+    codes = names.get_indexer(labels)
+    unseen = codes < 0
+    if unseen.any():
+        new = pd.Index(pd.unique(np.asarray(labels)[unseen])).dropna().sort_values()
+        if len(new):
+            names = names.append(new)
+            codes = names.get_indexer(labels)
+    return codes, names
+
+
+def extent(x, y):
+    """(xmin, ymin, xmax, ymax) of the finite points, or None if there are none."""
+    finite = np.isfinite(x) & np.isfinite(y)
+    if not finite.any():
+        return None
+    x, y = x[finite], y[finite]
+    return (x.min(), y.min(), x.max(), y.max())
+
+
+def figure_width(ax):
+    fig = ax.figure
+    return fig.get_size_inches()[0] * fig.dpi
+
+
+class Chart:
+    """
+    A chart drawn by Customplotlib.plot or scatter, kept to be drawn again
+    with new data.
+
+    update() hands the new rows to the artists that are already on the
+    axes: lines get set_data or set_segments, markers set_offsets, each
+    label's rows going to the artist drawn for that label. Styling, fonts,
+    titles and the legend are left as they are; the legend is only rebuilt
+    when a label appears that was not there before, and the view is only
+    rescaled when the data extent changed.
+    """
+
+    def __init__(self, owner, ax, assign=None, columns=(None, None, None), grouped=False, legend_loc=None):
+        self.owner = owner
+        self.ax = ax
+        self.assign = assign
+        self.columns = tuple(name if isinstance(name, str) else None for name in columns)
+        self.grouped = grouped
+        self.legend_loc = legend_loc
+        points = ax.dataLim.get_points()
+        self._extent = tuple(points[0]) + tuple(points[1])
+
+    def __repr__(self):
+        return f"<{type(self).__name__} on {self.ax!r}>"
+
+    @property
+    def figure(self):
+        return self.ax.figure
+
+    def update(self, data=None, x=None, y=None, label=None):
+        """
+        Draw the chart again with new data, in place.
+
+        Columns are taken from `data` by the names the chart was drawn with,
+        or given as x, y and label (arrays, or names of `data` columns).
+        Only point positions are replaced; per-point properties such as
+        sizes stay as they were drawn. Autosaves like plot and scatter do.
+        Returns the chart.
+        """
+        if self.assign is None:
+            raise ValueError("this chart cannot be updated in place; draw it again")
+        x, y, label = (self._column(data, value, name)
+                       for value, name in zip((x, y, label), self.columns))
+        if x is None or y is None:
+            raise ValueError("update needs x and y, as arrays or with data=")
+        if self.grouped and label is None:
+            raise ValueError("this chart is grouped by label; update needs label")
+
+        x, y = numeric(self.ax, x, y)
+        handles = self.assign(x, y, None if label is None else columns.as_labels(label, len(x)))
+        if handles is not None and self.legend_loc is not None:
+            self.ax.legend(handles=handles, bbox_to_anchor=self.legend_loc)
+        self._rescale(x, y)
+
+        if self.owner.scoped:
+            with self.owner.theme.context():
+                self.owner._autosave(self.ax.figure)
+        else:
+            self.owner._autosave(self.ax.figure)
+        return self
+
+    @staticmethod
+    def _column(data, value, name):
+        value = name if value is None else value
+        if data is not None and isinstance(value, str):
+            return columns.get_column(data, value)
+        return value
+
+    def _rescale(self, x, y):
+        """Autoscale to everything on the axes, if the new data's extent differs from the last."""
+        bounds = extent(x, y)
+        if bounds is None or bounds == self._extent:
+            return False
+        self._extent = bounds
+        # the data limits of every artist on the axes, not just this chart's;
+        # relim covers lines, patches and images, collections are added here
+        ax = self.ax
+        ax.relim()
+        for collection in ax.collections:
+            points = collection.get_datalim(ax.transData).get_points()
+            if np.isfinite(points).all():
+                ax.update_datalim(points)
+        ax.autoscale_view()
+        return True
+
+
+class Groups:
+    """
+    One artist per label. `draw(name, x, y)` makes the artist the first
+    time a label appears and `set_data(name, artist, x, y)` gives it new
+    rows after that; a label with no rows keeps its artist, emptied. Without
+    labels there is a single artist, under the name None.
+
+    Calling a Groups assigns the rows of each label to its artist and
+    returns every artist as legend handles if one was added, else None.
+    """
+
+    def __init__(self):
+        self.artists = {}
+
+    @property
+    def names(self):
+        return list(self.artists)
+
+    def __call__(self, x, y, labels=None):
+        if labels is None:
+            groups = [(None, np.arange(len(x)))]
+        else:
+            names, groups = columns.group_indices(labels)
+            known, names = align(names, self.names)
+            rows = dict(zip(names[known], groups))
+            empty = np.empty(0, dtype=np.intp)
+            groups = [(name, rows.get(name, empty)) for name in names]
+
+        added = False
+        for name, group in groups:
+            if name in self.artists:
+                self.set_data(name, self.artists[name], x[group], y[group])
+            else:
+                self.artists[name] = self.draw(name, x[group], y[group])
+                added = added or name is not None
+        return list(self.artists.values()) if added else None
+
+
+class LineGroups(Groups):
+    """
+    A Line2D per label, its rows sorted by x. With `downsample` each line
+    is decimated to about one point per pixel column of the figure, and
+    decimated again from the full series on zoom.
+    """
+
+    def __init__(self, ax, color=None, downsample=None, sort=True, **kwargs):
+        super().__init__()
+        self.ax = ax
+        self.color = color
+        self.downsample = downsample
+        self.sort = sort or bool(downsample)
+        self.kwargs = kwargs
+        self.decimators = {}
+
+    def _sorted(self, x, y):
+        if not self.sort:
+            return x, y
+        order = np.argsort(x, kind='stable')
+        return x[order], y[order]
+
+    def draw(self, name, x, y):
+        x, y = self._sorted(x, y)
+        kwargs = dict(self.kwargs, color=self.color)
+        if name is not None:
+            kwargs['label'] = name
+        if not self.downsample:
+            line, = self.ax.plot(x, y, **kwargs)
+            return line
+
+        # the decimator works on floats: convert dates and other units first
+        x, y = numeric(self.ax, x, y)
+        decimator = downsampling.Decimator([(x, y)], self.downsample, figure_width(self.ax))
+        (xs, ys), = decimator.decimate()
+        line, = self.ax.plot(xs, ys, **kwargs)
+        decimator.setter = lambda parts: line.set_data(*parts[0])
+        decimator.connect(self.ax)
+        self.decimators[name] = decimator
+        return line
+
+    def set_data(self, name, line, x, y):
+        x, y = self._sorted(x, y)
+        if name in self.decimators:
+            x, y = numeric(self.ax, x, y)
+            (x, y), = self.decimators[name].reset([(x, y)])
+        line.set_data(x, y)
+
+
+class MarkerGroups(Groups):
+    """A PathCollection per label, given new rows with set_offsets."""
+
+    def __init__(self, ax, color=None, markers=None, *args, **kwargs):
+        super().__init__()
+        self.ax = ax
+        self.color = color
+        self.markers = markers
+        self.args = args
+        self.kwargs = kwargs
+
+    def draw(self, name, x, y):
+        kwargs = dict(self.kwargs, color=self.color)
+        if name is not None:
+            kwargs['label'] = name
+        if self.markers:
+            kwargs['marker'] = self.markers[len(self.artists) % len(self.markers)]
+        return self.ax.scatter(*self.args, x=x, y=y, **kwargs)
+
+    def set_data(self, name, markers, x, y):
+        markers.set_offsets(np.column_stack([x, y]))
+
+
+class LineSegments:
+    """
+    Every label group as one polyline of a single LineCollection.
+
+    Points are ordered by (label, x) with one lexsort instead of sorting
+    each group, and each group's line gets the color and linestyle of the
+    prop cycle in sorted label order, as the per-group path would. Markers
+    from the cycle are not drawn. The legend is built from proxy handles,
+    limited to the `legend_max` largest groups when given. Later calls
+    reuse the collection, aligning groups by label; labels not seen before
+    get the next styles in the cycle.
+
+    Calling a LineSegments draws the rows and returns the legend handles
+    when they changed, else None.
+    """
+
+    def __init__(self, ax, color=None, legend_max=None, downsample=None, palette=(), **kwargs):
+        rc = matplotlib.rcParams
+        self.ax = ax
+        self.color = color
+        self.legend_max = legend_max
+        self.downsample = downsample
+        self.cycle = rc['axes.prop_cycle'].by_key()
+        self.palette = self.cycle.get('color', list(palette))
+        linestyle = kwargs.pop('linestyle', kwargs.pop('ls', rc['lines.linestyle']))
+        self.linestyles = self.cycle.get('linestyle', [linestyle])
+        kwargs.setdefault('linewidths', kwargs.pop('linewidth', kwargs.pop('lw', rc['lines.linewidth'])))
+        self.kwargs = kwargs
+        self.names = pd.Index([], dtype=object)
+        self.lines = None
+        self.decimator = None
+        self._shown = None
+
+    def _styles(self, count):
+        colors = [self.color] * count
+        if self.color is None:
+            colors = [self.palette[ix % len(self.palette)] for ix in range(count)]
+        linestyles = [self.linestyles[ix % len(self.linestyles)] for ix in range(count)]
+        return colors, linestyles
+
+    def __call__(self, x, y, labels):
+        x, y = numeric(self.ax, x, y)
+        codes, names = align(labels, self.names)
+        added = len(names) > len(self.names)
+        self.names = names
+
+        order = np.lexsort((x, codes))
+        codes = codes[order]
+        xy = np.column_stack([x[order], y[order]])
+        bounds = np.searchsorted(codes, np.arange(len(names) + 1))
+        segments = [xy[bounds[ix]:bounds[ix + 1]] for ix in range(len(names))]
+
+        if self.downsample:
+            series = [(seg[:, 0], seg[:, 1]) for seg in segments]
+            if self.decimator is None:
+                self.decimator = downsampling.Decimator(series, self.downsample, figure_width(self.ax))
+                parts = self.decimator.decimate()
+            else:
+                parts = self.decimator.reset(series)
+            segments = [np.column_stack(part) for part in parts]
+
+        colors, linestyles = self._styles(len(names))
+        if self.lines is None:
+            self.lines = LineCollection(segments, colors=colors, linestyles=linestyles, **self.kwargs)
+            self.ax.add_collection(self.lines, autolim=True)
+            self.ax.autoscale_view()
+            if self.decimator is not None:
+                lines = self.lines
+                self.decimator.setter = lambda parts: lines.set_segments([np.column_stack(part) for part in parts])
+                self.decimator.connect(self.ax)
+        else:
+            self.lines.set_segments(segments)
+            if added:
+                self.lines.set_color(colors)
+                self.lines.set_linestyles(linestyles)
+
+        shown = range(len(names))
+        if self.legend_max is not None and len(names) > self.legend_max:
+            sizes = np.diff(bounds)
+            shown = np.sort(np.argsort(-sizes, kind='stable')[:self.legend_max])
+        if not added and self._shown is not None and np.array_equal(shown, self._shown):
+            return None
+        self._shown = shown
+
+        return [Line2D([], [], label=names[ix], color=colors[ix], linestyle=linestyles[ix],
+                       linewidth=self.kwargs['linewidths'])
+                for ix in shown]
+
+
+class MarkerStyles:
+    """
+    All label groups with one PathCollection per distinct style.
+
+    Groups get colors (and markers in color_blind_mode) from the prop cycle
+    in sorted label order, as the per-group path would, so however many
+    labels there are, there are never more artists than entries in the
+    cycle. Each artist has a single color and marker, which keeps Agg on its
+    fast marker-stamping path. The legend is built from lightweight proxy
+    handles, limited to the `legend_max` largest groups when given. Later
+    calls reuse the artists, aligning groups by label.
+
+    Calling a MarkerStyles draws the rows and returns the legend handles
+    when they changed, else None.
+    """
+
+    def __init__(self, ax, color=None, legend_max=None, color_blind_mode=False, palette=(), *args, **kwargs):
+        cycle = matplotlib.rcParams['axes.prop_cycle'].by_key()
+        self.ax = ax
+        self.color = color
+        self.legend_max = legend_max
+        self.palette = cycle.get('color', list(palette))
+        self.markers = [kwargs.pop('marker', 'o')]
+        if color_blind_mode and 'marker' in cycle:
+            self.markers = cycle['marker']
+        self.args = args
+        self.kwargs = kwargs
+        self.names = pd.Index([], dtype=object)
+        self.group_colors = []
+        self.group_markers = []
+        self.group_styles = []
+        self.styles = {}
+        self.artists = []
+        self._shown = None
+
+    def __call__(self, x, y, labels):
+        codes, names = align(labels, self.names)
+        added = len(names) > len(self.names)
+        for ix in range(len(self.names), len(names)):
+            color = self.palette[ix % len(self.palette)] if self.color is None else self.color
+            marker = self.markers[ix % len(self.markers)]
+            # groups sharing a color and marker are drawn by the same artist
+            style = self.styles.setdefault((color, str(marker)), len(self.styles))
+            self.group_colors.append(color)
+            self.group_markers.append(marker)
+            self.group_styles.append(style)
+        self.names = names
+
+        x, y = np.asarray(x), np.asarray(y)
+        rows = np.flatnonzero(codes >= 0)
+        point_styles = np.asarray(self.group_styles, dtype=np.intp)[codes[rows]]
+        order = np.argsort(point_styles, kind='stable')
+        bounds = np.searchsorted(point_styles[order], np.arange(len(self.styles) + 1))
+        order = rows[order]
+        for style in range(len(self.styles)):
+            idx = order[bounds[style]:bounds[style + 1]]
+            if style < len(self.artists):
+                self.artists[style].set_offsets(np.column_stack([x[idx], y[idx]]))
+                continue
+            first = self.group_styles.index(style)
+            self.artists.append(self.ax.scatter(*self.args, **self.kwargs, x=x[idx], y=y[idx],
+                                                color=self.group_colors[first],
+                                                marker=self.group_markers[first]))
+
+        shown = range(len(names))
+        if self.legend_max is not None and len(names) > self.legend_max:
+            counts = np.bincount(codes[rows], minlength=len(names))
+            shown = np.sort(np.argsort(-counts, kind='stable')[:self.legend_max])
+        if not added and self._shown is not None and np.array_equal(shown, self._shown):
+            return None
+        self._shown = shown
+
+        return [Line2D([], [], linestyle='', label=names[ix], marker=self.group_markers[ix],
+                       color=self.group_colors[ix])
+                for ix in shown]
@@ -0,0 +1,70 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+import numpy as np
+import pandas as pd
+
+
+# +
+def get_column(data, name):
+    """
+    Return column `name` of `data` as a 1-D NumPy array, without copying the
+    rest of the frame.
+    
+    pandas, polars and pyarrow columns come back as views of the underlying
+    buffer whenever their dtype allows it; anything else that can be indexed
+    by column name goes through np.asarray. Objects that only implement the
+    dataframe interchange protocol are narrowed to the one column before
+    being converted.
+    """
+    try:
+        column = data[name]
+    except (KeyError, TypeError, IndexError):
+        if not hasattr(data, '__dataframe__'):
+            raise
+        interchange = data.__dataframe__().select_columns_by_name([name])
+        column = pd.api.interchange.from_dataframe(interchange)[name]
+    
+    if hasattr(column, 'to_numpy'):
+        return column.to_numpy()
+    return np.asarray(column)
+
+
+def get_columns(data, *names):
+    """get_column for several columns at once, returned as a list."""
+    return [get_column(data, name) for name in names]
+
+
+def as_labels(label, count):
+    """Per-row labels: `label` as an array, or repeated `count` times if it is a single label."""
+    if np.ndim(label) == 0:
+        return np.full(count, label, dtype=object)
+    return np.asarray(label)
+
+
+def group_indices(labels):
+    """
+    Split row positions by label.
+    
+    Returns `(names, groups)`, where `names` holds the distinct labels in
+    sorted order and `groups` the matching arrays of row positions. Missing
+    labels are dropped, as they are by DataFrame.groupby. The labels are
+    factorized once and the positions come from a single stable argsort, so
+    nothing is copied but the index arrays.
+    """
+    codes, names = pd.factorize(labels, sort=True)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+    return names, [order[bounds[ix]:bounds[ix + 1]] for ix in range(len(names))]
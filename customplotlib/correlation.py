@@ -0,0 +1,133 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+# +
+METHODS = ('pearson', 'spearman')
+
+# columns per block of the Gram matrix; a pair of float32 blocks for a
+# million rows is 4 GB / 1024 columns, so larger frames stay in memory
+BLOCK = 512
+
+
+def numeric(df):
+    """
+    The numeric columns of `df` as (names, float32 array of shape (rows,
+    columns)), selected once. The array is column-major, so column blocks
+    are contiguous.
+    """
+    frame = df.select_dtypes(['number'])
+    return frame.columns, np.asfortranarray(frame.to_numpy(dtype=np.float32))
+
+
+def gram(z, block=BLOCK, workers=None):
+    """
+    z.T @ z, one pair of column blocks at a time and only for the upper
+    triangle, mirrored into the lower one.
+    
+    Each block product is a float32 BLAS call, which is multithreaded on its
+    own; `workers` > 1 additionally runs that many block products at once.
+    """
+    columns = z.shape[1]
+    out = np.empty((columns, columns), dtype=z.dtype)
+    starts = range(0, columns, block)
+    pairs = [(i, j) for i in starts for j in starts if j >= i]
+    
+    def product(pair):
+        i, j = pair
+        out[i:i + block, j:j + block] = z[:, i:i + block].T @ z[:, j:j + block]
+        if i != j:
+            out[j:j + block, i:i + block] = out[i:i + block, j:j + block].T
+    
+    if workers is None or workers <= 1:
+        for pair in pairs:
+            product(pair)
+    else:
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(product, pairs))
+    return out
+
+
+def ranks(values):
+    """
+    Column-wise ranks of a (rows, columns) array as float32, ties sharing
+    their average rank like DataFrame.rank().
+    """
+    rows = values.shape[0]
+    out = np.empty(values.shape, dtype=np.float32, order='F')
+    for ix in range(values.shape[1]):
+        column = values[:, ix]
+        order = np.argsort(column, kind='stable')
+        ordered = column[order]
+        first = np.empty(rows, dtype=bool)
+        first[:1] = True
+        np.not_equal(ordered[1:], ordered[:-1], out=first[1:])
+        starts = np.flatnonzero(first)
+        stops = np.append(starts[1:], rows)
+        out[order, ix] = np.repeat((starts + stops + 1) / 2, stops - starts)
+    return out
+
+
+def correlation(values, method='pearson', block=BLOCK, workers=None):
+    """
+    Column correlation matrix of a (rows, columns) array, as float32.
+    
+    Columns are standardized once and the matrix is their Gram matrix (see
+    gram). Spearman correlates the column ranks. Constant columns get NaN,
+    as in DataFrame.corr. Data with missing values falls back to
+    DataFrame.corr, which handles them pairwise.
+    """
+    if method not in METHODS:
+        raise ValueError(f"corr must be one of {METHODS}, not {method!r}")
+    values = np.asarray(values)
+    if np.isnan(values).any():
+        return pd.DataFrame(values).corr(method=method).to_numpy(dtype=np.float32)
+    if method == 'spearman':
+        values = ranks(values)
+    
+    # center with float64 means and scale with float64 norms, so float32
+    # only rounds the final products
+    z = np.asfortranarray(values, dtype=np.float32)
+    z = z - z.mean(axis=0, dtype=np.float64).astype(np.float32)
+    norm = np.sqrt(np.einsum('ij,ij->j', z, z, dtype=np.float64))
+    constant = norm == 0
+    norm[constant] = 1
+    z /= norm.astype(np.float32)
+    
+    matrix = gram(z, block=block, workers=workers)
+    np.clip(matrix, -1, 1, out=matrix)
+    np.fill_diagonal(matrix, 1)
+    matrix[constant, :] = np.nan
+    matrix[:, constant] = np.nan
+    return matrix
+
+
+def cluster_order(matrix, method='average'):
+    """
+    Column order that puts correlated columns next to each other: the leaves
+    of a hierarchical clustering on 1 - correlation. Needs scipy.
+    """
+    from scipy.cluster import hierarchy
+    from scipy.spatial.distance import squareform
+    
+    distance = 1 - np.nan_to_num(np.asarray(matrix, dtype=float), nan=0.)
+    distance = np.clip((distance + distance.T) / 2, 0, None)
+    np.fill_diagonal(distance, 0)
+    return hierarchy.leaves_list(hierarchy.linkage(squareform(distance, checks=False), method=method))
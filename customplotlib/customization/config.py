@@ -6,6 +6,9 @@ from collections import OrderedDict
 FIGSIZE = (10,6)
 FIGSAVEPATH = '../saved_figs/'
 AUTOSAVE = True
+RENDER_CACHE_PATH = FIGSAVEPATH + '.render_cache/'
+RENDER_CACHE_SIZE = 256 * 2**20
+FIGURE_POOL_SIZE = 4
 
 
 ### font
@@ -14,20 +14,24 @@
 
 # +
 from matplotlib import colors as matplotcolors
+import matplotlib
 import numpy as np
+import pandas as pd
 import os
 import matplotlib.pyplot as plt
 from matplotlib import cm
 
-from customplotlib.customization.config import MAINS, SUPPS
+from customplotlib.customization.config import MAINS, SUPPS, OFFICIAL
 from customplotlib.customization.config import GRADIENT_LIGHT_DARK, GRADIENT_HOT_COLD, GRADIENT_RAINBOW, GRADIENT_BW
+from customplotlib.customization.config import GRADIENTS
 
 
 # +
 def clamp(x): 
     return max(0, min(x, 255))
 
-vclamp = np.vectorize(clamp)
+def vclamp(x):
+    return np.clip(x, 0, 255)
 
 def hex_to_rgb(h):
     h = h.replace('#', "")
@@ -65,25 +69,135 @@ def get_rgb_color(c):
         raise ValueError(f"{c} is invalid. Either not a hexcolor, RGB tuple, or aliased color name")
 
 
+# +
+# every aliased color name mapped to its hex code, MAINS winning over SUPPS
+# and SUPPS over OFFICIAL when a name appears in more than one palette
+COLOR_INDEX = {**OFFICIAL, **SUPPS, **MAINS}
+
+# ascii code -> value of that hex digit, -1 for anything else
+_HEX_DIGITS = np.full(256, -1, dtype=np.int16)
+for _i, _c in enumerate('0123456789abcdef'):
+    _HEX_DIGITS[ord(_c)] = _i
+    _HEX_DIGITS[ord(_c.upper())] = _i
+
+_HEX_PAIRS = np.array([f"{i:02X}" for i in range(256)])
+
+
+def _parse_hex(hexes):
+    hexes = np.char.lstrip(np.asarray(hexes, dtype=str), '#')
+    lengths = np.char.str_len(hexes)
+    if hexes.size and (lengths != 6).any():
+        bad = hexes[lengths != 6][0]
+        raise ValueError(f"{bad} is invalid. Either not a hexcolor, RGB tuple, or aliased color name")
+    digits = _HEX_DIGITS[np.char.encode(hexes, 'ascii').view(np.uint8).reshape(-1, 6)]
+    if (digits < 0).any():
+        bad = hexes[(digits < 0).any(axis=1)][0]
+        raise ValueError(f"{bad} is invalid. Either not a hexcolor, RGB tuple, or aliased color name")
+    return (digits[:, 0::2] * 16 + digits[:, 1::2]).astype(np.uint8)
+
+
+def get_rgb_colors(colors, alpha=None, dtype=np.uint8):
+    """
+    Vectorized get_rgb_color for many colors at once.
+
+    `colors` is an array, list or Series of hex strings and aliased color
+    names, or an (N, 3) array of RGB triples on the 0-255 scale. Returns an
+    (N, 3) array, or (N, 4) when `alpha` (a scalar or length N array on the
+    0-1 scale) is given. Integer dtypes are on the 0-255 scale, float dtypes
+    on the 0-1 scale matplotlib expects.
+    """
+    try:
+        arr = np.asarray(colors)
+    except ValueError:
+        # a mix of names and RGB triples
+        arr = np.empty(len(colors), dtype=object)
+        arr[:] = [tuple(c) if isinstance(c, list) else c for c in colors]
+    if arr.dtype == object and arr.size and not isinstance(arr.flat[0], str):
+        try:
+            arr = np.array(arr.tolist())
+        except ValueError:
+            pass
+    
+    if arr.size == 0:
+        rgb = np.empty((0, 3), dtype=np.uint8)
+    elif arr.dtype.kind in 'biuf':
+        if arr.ndim != 2 or arr.shape[1] != 3:
+            raise ValueError(f"expected an (N, 3) array of RGB triples, got shape {arr.shape}")
+        rgb = vclamp(np.rint(arr)).astype(np.uint8)
+    else:
+        # resolve each distinct value once, then broadcast back to every row
+        codes, uniques = pd.factorize(arr.ravel())
+        hexes = [COLOR_INDEX.get(c, c) if isinstance(c, str) else rgb_to_hex(c) for c in uniques]
+        rgb = _parse_hex(hexes)[codes]
+    
+    if alpha is not None:
+        alpha = np.broadcast_to(np.asarray(alpha, dtype=float) * 255, (len(rgb),))
+        rgb = np.column_stack([rgb, vclamp(np.rint(alpha)).astype(np.uint8)])
+    
+    if np.dtype(dtype).kind == 'f':
+        return rgb.astype(dtype) / 255
+    return rgb.astype(dtype, copy=False)
+
+
+def get_hex_colors(colors):
+    """Vectorized get_hex_color, returning an array of '#RRGGBB' strings."""
+    rgb = get_rgb_colors(colors)
+    return np.char.add(np.char.add(np.char.add('#', _HEX_PAIRS[rgb[:, 0]]),
+                                   _HEX_PAIRS[rgb[:, 1]]),
+                       _HEX_PAIRS[rgb[:, 2]])
+
+
 # -
 
 def inter_from_256(x):
     return np.interp(x=x,xp=[0,255],fp=[0,1])
 
 
-def get_gradient(colors):
-    wts = np.linspace(0,1, len(colors))
-    colors = [get_rgb_color(c) for c in colors]
+# compiled colormaps, keyed by (name, colors, invert)
+_GRADIENT_CACHE = {}
+
+
+def _gradient_key(colors):
+    return tuple(tuple(c) if isinstance(c, list) else c for c in colors)
+
+
+def get_gradient(colors, invert=False, name=None, register=False):
+    """
+    Return a LinearSegmentedColormap running through `colors`.
+
+    `colors` is either a key of GRADIENTS or a sequence of hex colors, RGB
+    tuples or aliased color names. Colormaps are compiled once and shared
+    between calls, so treat the result as read-only. The input list is never
+    modified; `invert` builds a separate reversed colormap.
+
+    With `register=True` the colormap is also registered with matplotlib as
+    ``customplotlib.<name>`` (``customplotlib.<name>_r`` when inverted) so it
+    can be passed around by name, e.g. ``cmap='customplotlib.hot_cold'``.
+    """
+    if isinstance(colors, str):
+        name = colors if name is None else name
+        colors = GRADIENTS[colors]
+    key = (name, _gradient_key(colors), bool(invert))
     
-    cdict = {
-    'red':[(wts[ix],
-            inter_from_256(colors[ix][0]),
-            inter_from_256(colors[ix][0])) for ix in range(len(colors))],
-    'green':[(wts[ix],
-              inter_from_256(colors[ix][1]),
-              inter_from_256(colors[ix][1])) for ix in range(len(colors))],
-    'blue': [(wts[ix],
-              inter_from_256(colors[ix][2]),
-              inter_from_256(colors[ix][2])) for ix in range(len(colors))],
-    }
-    return matplotcolors.LinearSegmentedColormap('gradient',segmentdata=cdict)
+    cmap = _GRADIENT_CACHE.get(key)
+    if cmap is None:
+        rgb = np.array([get_rgb_color(c) for c in colors], dtype=float) / 255
+        if invert:
+            rgb = rgb[::-1]
+        cmap_name = 'gradient' if name is None else f"customplotlib.{name}" + ('_r' if invert else '')
+        cmap = matplotcolors.LinearSegmentedColormap.from_list(cmap_name, rgb)
+        _GRADIENT_CACHE[key] = cmap
+    
+    if register:
+        if name is None:
+            raise ValueError("a name is needed to register an unnamed gradient")
+        if cmap.name not in matplotlib.colormaps:
+            matplotlib.colormaps.register(cmap)
+    return cmap
+
+
+def register_gradients():
+    """Register every gradient in GRADIENTS, and its inverse, with matplotlib."""
+    for name in GRADIENTS:
+        get_gradient(name, register=True)
+        get_gradient(name, invert=True, register=True)
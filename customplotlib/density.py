@@ -0,0 +1,75 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+import numpy as np
+
+
+# +
+REDUCTIONS = ('count', 'sum', 'mean')
+
+
+def data_extent(x, y):
+    """(xmin, xmax, ymin, ymax) over the finite points, padded if degenerate."""
+    finite = np.isfinite(x) & np.isfinite(y)
+    if not finite.any():
+        return (0., 1., 0., 1.)
+    xmin, xmax = x[finite].min(), x[finite].max()
+    ymin, ymax = y[finite].min(), y[finite].max()
+    if xmin == xmax:
+        xmin, xmax = xmin - 0.5, xmax + 0.5
+    if ymin == ymax:
+        ymin, ymax = ymin - 0.5, ymax + 0.5
+    return (float(xmin), float(xmax), float(ymin), float(ymax))
+
+
+def bin2d(x, y, shape, extent, values=None, reduce='count'):
+    """
+    Reduce points onto a regular grid in one vectorized pass.
+    
+    `shape` is (columns, rows) and `extent` is (xmin, xmax, ymin, ymax).
+    Returns a (rows, columns) float array ready for imshow(origin='lower'):
+    the number of points per cell for 'count', or the sum or mean of
+    `values` per cell for 'sum' and 'mean'. Cells without points are NaN for
+    'mean' and 0 otherwise. Points outside `extent` or with non-finite
+    coordinates are ignored.
+    """
+    if reduce not in REDUCTIONS:
+        raise ValueError(f"reduce must be one of {REDUCTIONS}, not {reduce!r}")
+    if reduce != 'count' and values is None:
+        raise ValueError(f"reduce={reduce!r} needs values")
+    
+    nx, ny = (max(int(n), 1) for n in shape)
+    xmin, xmax, ymin, ymax = extent
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    
+    col = np.floor((x - xmin) * (nx / (xmax - xmin)))
+    row = np.floor((y - ymin) * (ny / (ymax - ymin)))
+    # points exactly on the upper edge belong to the last cell
+    col[x == xmax] = nx - 1
+    row[y == ymax] = ny - 1
+    inside = (col >= 0) & (col < nx) & (row >= 0) & (row < ny)
+    flat = (row[inside] * nx + col[inside]).astype(np.intp)
+    
+    counts = np.bincount(flat, minlength=nx * ny).astype(float)
+    if reduce == 'count':
+        grid = counts
+    else:
+        weights = np.asarray(values, dtype=float)[inside]
+        grid = np.bincount(flat, weights=weights, minlength=nx * ny)
+        if reduce == 'mean':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                grid = np.where(counts > 0, grid / counts, np.nan)
+    return grid.reshape(ny, nx)
@@ -0,0 +1,130 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+import numpy as np
+
+
+# +
+def lttb(x, y, n):
+    """
+    Indices of the `n` points picked by Largest-Triangle-Three-Buckets.
+    
+    `x` must be sorted. The first and last points are always kept; every
+    bucket in between contributes the point forming the largest triangle with
+    the previously kept point and the mean of the next bucket.
+    """
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+    
+    edges = (np.arange(n - 1) * ((size - 2) / (n - 2))).astype(np.intp) + 1
+    edges[-1] = size - 1
+    counts = np.diff(edges)
+    # mean of every bucket, plus the last point standing in for the bucket
+    # after the final one
+    mean_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1])
+    mean_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / counts, y[-1])
+    
+    out = np.empty(n, dtype=np.intp)
+    out[0], out[-1] = 0, size - 1
+    a = 0
+    for ix in range(n - 2):
+        start, end = edges[ix], edges[ix + 1]
+        area = np.abs((x[a] - mean_x[ix + 1]) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (mean_y[ix + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        out[ix + 1] = a
+    return out
+
+
+def _first_match(values, targets, bucket_of):
+    hits = np.flatnonzero(values == targets[bucket_of])
+    _, first = np.unique(bucket_of[hits], return_index=True)
+    return hits[first]
+
+
+def minmax(x, y, n):
+    """
+    Indices of the first, last, minimum and maximum point of `n` equal-width
+    x buckets, in x order.
+    
+    `x` must be sorted. With one bucket per pixel column the decimated line
+    covers exactly the same pixels as the full one.
+    """
+    size = len(x)
+    if 4 * n >= size or n < 1:
+        return np.arange(size)
+    
+    starts = np.searchsorted(x, np.linspace(x[0], x[-1], n + 1)[:-1])
+    starts = np.unique(starts[starts < size])
+    bucket_of = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, size)))
+    
+    lows = _first_match(y, np.fmin.reduceat(y, starts), bucket_of)
+    highs = _first_match(y, np.fmax.reduceat(y, starts), bucket_of)
+    ends = np.append(starts[1:] - 1, size - 1)
+    return np.unique(np.concatenate([starts, ends, lows, highs]))
+
+
+METHODS = {'lttb': lttb, 'minmax': minmax}
+
+
+class Decimator:
+    """
+    Keeps the full-resolution series behind one or more drawn lines and
+    hands the artist a decimated copy for the visible x range.
+    
+    `setter` receives a list of `(x, y)` pairs, one per series. Once
+    connected to an Axes, the series are decimated again whenever the x
+    limits change, so zooming in brings back detail.
+    """
+    
+    def __init__(self, series, method, width, setter=None):
+        if method not in METHODS:
+            raise ValueError(f"downsample must be one of {sorted(METHODS)}, not {method!r}")
+        self.series = [(np.asarray(x, dtype=float), np.asarray(y, dtype=float)) for x, y in series]
+        self.method = METHODS[method]
+        self.width = max(int(width), 1)
+        self.setter = setter
+        self._window = None
+    
+    def decimate(self, xlim=None):
+        parts = []
+        for x, y in self.series:
+            lo, hi = 0, len(x)
+            if xlim is not None:
+                # keep one point past each edge so the line reaches the frame
+                lo = max(np.searchsorted(x, min(xlim), side='left') - 1, 0)
+                hi = min(np.searchsorted(x, max(xlim), side='right') + 1, len(x))
+            idx = lo + self.method(x[lo:hi], y[lo:hi], self.width)
+            parts.append((x[idx], y[idx]))
+        return parts
+    
+    def reset(self, series):
+        """Swap in new full-resolution series; returns them decimated in full."""
+        self.series = [(np.asarray(x, dtype=float), np.asarray(y, dtype=float)) for x, y in series]
+        self._window = None
+        return self.decimate()
+    
+    def update(self, xlim):
+        window = tuple(xlim)
+        if window == self._window:
+            return
+        self._window = window
+        self.setter(self.decimate(xlim))
+    
+    def connect(self, ax):
+        self._window = tuple(ax.get_xlim())
+        # a plain function, not a bound method, so the registry keeps us alive
+        return ax.callbacks.connect('xlim_changed', lambda ax: self.update(ax.get_xlim()))
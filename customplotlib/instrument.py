@@ -0,0 +1,192 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+import contextlib
+import threading
+import time
+from collections import deque
+
+
+# +
+PROFILERS = ('cprofile', 'tracemalloc')
+
+
+class _Off:
+    """Recorder used while instrumentation is off; every mark is a no-op."""
+    __slots__ = ()
+
+    def phase(self, name):
+        pass
+
+    def size(self, **sizes):
+        pass
+
+
+OFF = _Off()
+
+
+class CallRecord:
+    """
+    Timings of one plotting call.
+
+    `phases` maps phase names ('prepare', 'artists', 'legend', 'labels',
+    'save', ...) to seconds in the order they ran, and `sizes` holds the
+    input sizes the method reported (rows, groups, columns). With profiling
+    on, `profile` is a pstats.Stats ('cprofile') and `peak_memory` the peak
+    bytes traced during the call ('tracemalloc').
+    """
+    __slots__ = ('method', 'started', 'seconds', 'phases', 'sizes', 'error',
+                 'profile', 'peak_memory', '_phase', '_mark')
+
+    def __init__(self, method):
+        self.method = method
+        self.started = time.time()
+        self.seconds = None
+        self.phases = {}
+        self.sizes = {}
+        self.error = None
+        self.profile = None
+        self.peak_memory = None
+        self._phase = 'prepare'
+        self._mark = time.perf_counter()
+
+    def phase(self, name):
+        """End the running phase and start `name`."""
+        now = time.perf_counter()
+        self.phases[self._phase] = self.phases.get(self._phase, 0.) + now - self._mark
+        self._phase, self._mark = name, now
+
+    def size(self, **sizes):
+        self.sizes.update(sizes)
+
+    def to_dict(self):
+        """The record as plain values, without the profile."""
+        return {'method': self.method, 'started': self.started, 'seconds': self.seconds,
+                'phases': dict(self.phases), 'sizes': dict(self.sizes),
+                'error': self.error, 'peak_memory': self.peak_memory}
+
+    def __repr__(self):
+        phases = ', '.join(f"{name}={seconds * 1e3:.2f}ms" for name, seconds in self.phases.items())
+        return f"CallRecord({self.method}, {self.seconds * 1e3:.2f}ms: {phases})"
+
+
+class Stats:
+    """
+    Aggregate of the recorded calls: the last `keep` CallRecords plus
+    running per-method call counts, seconds and phase totals over all calls.
+    """
+
+    def __init__(self, keep=1000):
+        self.records = deque(maxlen=keep)
+        self.calls = {}
+        self.seconds = {}
+        self.phases = {}
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+            method = record.method
+            self.calls[method] = self.calls.get(method, 0) + 1
+            self.seconds[method] = self.seconds.get(method, 0.) + record.seconds
+            phases = self.phases.setdefault(method, {})
+            for name, seconds in record.phases.items():
+                phases[name] = phases.get(name, 0.) + seconds
+
+    def reset(self):
+        with self._lock:
+            self.records.clear()
+            self.calls.clear()
+            self.seconds.clear()
+            self.phases.clear()
+
+    def summary(self):
+        """Per method: calls, total and mean seconds, and seconds per phase."""
+        with self._lock:
+            return {method: {'calls': calls,
+                             'seconds': self.seconds[method],
+                             'mean': self.seconds[method] / calls,
+                             'phases': dict(self.phases[method])}
+                    for method, calls in self.calls.items()}
+
+    def __len__(self):
+        return len(self.records)
+
+    def __repr__(self):
+        lines = [f"{method}: {row['calls']} calls, {row['mean'] * 1e3:.2f}ms mean"
+                 for method, row in self.summary().items()]
+        return '\n'.join(['Stats'] + lines)
+
+
+class Instrumentation:
+    """
+    Records a CallRecord per plotting call into `stats` and hands it to
+    `callback`, if one is given. `profile` additionally captures a cProfile
+    ('cprofile') or the peak traced memory ('tracemalloc') of each call;
+    both slow the call down considerably, plain timing does not.
+    """
+
+    def __init__(self, callback=None, profile=None, keep=1000):
+        if profile is not None and profile not in PROFILERS:
+            raise ValueError(f"profile must be one of {PROFILERS} or None, not {profile!r}")
+        self.callback = callback
+        self.profile = profile
+        self.stats = Stats(keep)
+
+    @contextlib.contextmanager
+    def call(self, method):
+        """Time the body as one call of `method`; yields its CallRecord."""
+        record = CallRecord(method)
+        profiler = self._start()
+        start = record._mark
+        try:
+            yield record
+        except BaseException as error:
+            record.error = repr(error)
+            raise
+        finally:
+            record.phase(None)
+            record.seconds = record._mark - start
+            self._stop(profiler, record)
+            self.stats.add(record)
+            if self.callback is not None:
+                self.callback(record)
+
+    def _start(self):
+        if self.profile == 'cprofile':
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+        if self.profile == 'tracemalloc':
+            import tracemalloc
+            started = tracemalloc.is_tracing()
+            if started:
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+            return started
+        return None
+
+    def _stop(self, profiler, record):
+        if self.profile == 'cprofile':
+            import pstats
+            profiler.disable()
+            record.profile = pstats.Stats(profiler)
+        elif self.profile == 'tracemalloc':
+            import tracemalloc
+            record.peak_memory = tracemalloc.get_traced_memory()[1]
+            if not profiler:
+                tracemalloc.stop()
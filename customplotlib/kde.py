@@ -0,0 +1,190 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+import numpy as np
+
+
+# +
+BANDWIDTHS = ('scott', 'silverman')
+
+# values are summarized and binned this many at a time, so 10^8 points never
+# allocate more than a few chunk-sized temporaries
+CHUNK = 1 << 16
+
+MAX_BINS = 1 << 18
+
+
+def _summary(x, weights):
+    """
+    (min, max, mean, unbiased variance, effective sample size) in one pass,
+    matching what scipy.stats.gaussian_kde computes for its bandwidth.
+    """
+    # deviations from a sample value keep the sums of squares well conditioned
+    shift = float(x[0])
+    buf = np.empty(min(CHUNK, x.size))
+    xmin, xmax, s, ss = np.inf, -np.inf, 0., 0.
+    sw, sww = float(x.size), float(x.size)
+    if weights is not None:
+        sw, sww = float(weights.sum()), float(np.dot(weights, weights))
+    for i in range(0, x.size, CHUNK):
+        c = x[i:i + CHUNK]
+        xmin, xmax = min(xmin, c.min()), max(xmax, c.max())
+        d = np.subtract(c, shift, out=buf[:c.size])
+        if weights is None:
+            s += float(d.sum())
+            ss += float(np.dot(d, d))
+        else:
+            w = weights[i:i + CHUNK]
+            s += float(np.dot(w, d))
+            d *= d
+            ss += float(np.dot(w, d))
+    var = (ss - s * s / sw) / max(sw - sww / sw, np.finfo(float).tiny)
+    return float(xmin), float(xmax), shift + s / sw, var, sw * sw / sww
+
+
+def _prepare(x, weights):
+    """Flat float arrays with non-finite values (or weights) dropped, and their summary."""
+    x = np.asarray(x, dtype=float).ravel()
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float).ravel()
+        if weights.shape != x.shape:
+            raise ValueError("weights must have the same length as x")
+    if x.size:
+        summary = _summary(x, weights)
+        if np.isfinite(summary[:4]).all():
+            return x, weights, summary
+    keep = np.isfinite(x)
+    if weights is not None:
+        keep &= np.isfinite(weights)
+        weights = weights[keep]
+    x = x[keep]
+    if x.size < 2:
+        raise ValueError("a kernel density estimate needs at least two finite values")
+    return x, weights, _summary(x, weights)
+
+
+def _bandwidth(summary, method):
+    var, neff = summary[3], summary[4]
+    if method is None or method == 'scott':
+        factor = neff ** (-1 / 5)
+    elif method == 'silverman':
+        factor = (neff * 3 / 4) ** (-1 / 5)
+    elif np.isscalar(method) and not isinstance(method, str):
+        factor = float(method)
+    else:
+        raise ValueError(f"bw_method must be one of {BANDWIDTHS} or a number, not {method!r}")
+    if not var > 0:
+        raise ValueError("a kernel density estimate needs values that are not all equal")
+    return factor * np.sqrt(var)
+
+
+def bandwidth(x, method='scott', weights=None):
+    """
+    Gaussian kernel standard deviation for `x`.
+    
+    `method` is 'scott', 'silverman' or a scalar factor, with the same
+    meaning as `bw_method` in scipy.stats.gaussian_kde and seaborn.
+    """
+    x, weights, summary = _prepare(x, weights)
+    return _bandwidth(summary, method)
+
+
+def linear_bin(x, lo, hi, bins, weights=None):
+    """
+    Spread each value over its two nearest points of a `bins`-point grid
+    from `lo` to `hi`, in proportion to how close it is to each.
+    """
+    # each chunk costs O(bins) to accumulate, so fine grids get longer chunks
+    chunk = max(CHUNK, 4 * bins)
+    size = min(chunk, x.size)
+    pos, floor, left = np.empty(size), np.empty(size), np.empty(size, dtype=np.intp)
+    scale = (bins - 1) / (hi - lo)
+    # without weights, count and right-hand share come from one bincount: each
+    # value adds `pack` + its share, and a chunk's shares sum to less than `pack`
+    pack = float(2 * chunk)
+    mass = np.zeros(bins + 1)
+    right = np.zeros(bins + 1)
+    for i in range(0, x.size, chunk):
+        c = x[i:i + chunk]
+        n = c.size
+        p = np.subtract(c, lo, out=pos[:n])
+        p *= scale
+        f = np.floor(p, out=floor[:n])
+        l = left[:n]
+        l[...] = f
+        p -= f
+        if weights is None:
+            p += pack
+            packed = np.bincount(l, p, minlength=bins + 1)
+            count = np.floor(packed / pack)
+            mass += count
+            right += packed - count * pack
+        else:
+            w = weights[i:i + chunk]
+            p *= w
+            mass += np.bincount(l, w, minlength=bins + 1)
+            right += np.bincount(l, p, minlength=bins + 1)
+    mass -= right
+    mass[1:] += right[:-1]
+    mass[bins - 1] += mass[bins]
+    return mass[:bins]
+
+
+def _grid_size(span, bw, bins):
+    if bins is not None:
+        return max(int(bins), 2)
+    # eight bins per bandwidth bound the binning error at about 1/1500 of the
+    # peak density; very long tails are capped because binning into grids
+    # much larger than the CPU cache is slower than the rest put together
+    need = int(np.ceil(8 * span / bw)) + 1
+    return int(min(max(1 << (need - 1).bit_length(), 1024), MAX_BINS))
+
+
+def fft_kde(x, weights=None, bw_method='scott', bw_adjust=1, gridsize=200,
+            cut=3, clip=None, bins=None):
+    """
+    Gaussian kernel density estimate of `x` by linear binning and FFT
+    convolution, O(n + bins log bins) instead of O(n * gridsize).
+    
+    Parameters mirror seaborn.kdeplot: the curve is evaluated at `gridsize`
+    points from `cut` bandwidths below the smallest value to `cut` above the
+    largest, limited to `clip`. `bins` overrides the automatic size of the
+    internal grid. Returns (support, density).
+    """
+    x, weights, summary = _prepare(x, weights)
+    bw = _bandwidth(summary, bw_method) * bw_adjust
+    
+    xmin, xmax = summary[0], summary[1]
+    clip_lo, clip_hi = (None, None) if clip is None else clip
+    lo = xmin - cut * bw if clip_lo is None else max(xmin - cut * bw, clip_lo)
+    hi = xmax + cut * bw if clip_hi is None else min(xmax + cut * bw, clip_hi)
+    support = np.linspace(lo, hi, gridsize)
+    
+    # every value contributes, clipped or not, so bin over the data as well
+    glo, ghi = min(lo, xmin), max(hi, xmax)
+    bins = _grid_size(ghi - glo, bw, bins)
+    counts = linear_bin(x, glo, ghi, bins, weights)
+    counts /= counts.sum()
+    
+    # zero padding to twice the grid makes the circular convolution linear
+    step = (ghi - glo) / (bins - 1)
+    lags = np.arange(-(bins - 1), bins) * step
+    kernel = np.exp(-0.5 * (lags / bw) ** 2) / (bw * np.sqrt(2 * np.pi))
+    size = 1 << (counts.size + kernel.size - 2).bit_length()
+    smooth = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size)
+    grid_density = np.maximum(smooth[bins - 1:2 * bins - 1], 0)
+    
+    grid = np.linspace(glo, ghi, bins)
+    return support, np.interp(support, grid, grid_density)
@@ -0,0 +1,187 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+import matplotlib.pyplot as pyplot
+from matplotlib.transforms import Bbox
+
+from customplotlib.cache import rc_digest
+
+
+# +
+def _cids(registry):
+    return {cid for signal in registry.callbacks.values() for cid in signal}
+
+
+class _Baseline:
+    """What a pooled figure's axes looked like when it was made."""
+
+    def __init__(self, fig, ax):
+        self.rc = rc_digest()
+        self.children = set(ax.get_children())
+        self.callbacks = (_cids(ax.callbacks), _cids(fig.canvas.callbacks))
+        self.position = ax.get_position().bounds
+        self.facecolor = ax.get_facecolor()
+        self.spines = {name: spine.get_visible() for name, spine in ax.spines.items()}
+        self.axes = []
+        for axis in (ax.xaxis, ax.yaxis):
+            self.axes.append((axis.get_major_locator(), axis.get_minor_locator(),
+                              axis.get_major_formatter(), axis.get_minor_formatter(),
+                              dict(axis._major_tick_kw), dict(axis._minor_tick_kw)))
+
+    def matches(self, fig, ax):
+        """True if only what a light reset undoes has changed since."""
+        if (fig.axes != [ax] or fig.texts or fig.legends or fig.images or fig.patches
+                or fig.lines or fig.artists or fig.subfigs):
+            return False
+        if (ax.get_xscale() != 'linear' or ax.get_yscale() != 'linear' or ax.get_aspect() != 'auto'
+                or not ax.axison or ax.xaxis_inverted() or ax.yaxis_inverted()):
+            return False
+        if (ax.get_position().bounds != self.position or ax.get_facecolor() != self.facecolor
+                or {name: spine.get_visible() for name, spine in ax.spines.items()} != self.spines):
+            return False
+        for axis, state in zip((ax.xaxis, ax.yaxis), self.axes):
+            if axis.have_units():
+                return False
+            if (axis.get_major_locator(), axis.get_minor_locator(),
+                    axis.get_major_formatter(), axis.get_minor_formatter()) != state[:4]:
+                return False
+            if axis._major_tick_kw != state[4] or axis._minor_tick_kw != state[5]:
+                return False
+        return True
+
+
+class FigurePool:
+    """
+    Up to `size` idle pyplot figures, each with one Axes, handed out again
+    instead of closing them and making new ones.
+
+    Making the Axes is most of the setup cost of a small chart, and
+    Axes.clear() costs as much again, so a released figure is only reset
+    lightly: the artists drawn since it was made are removed and the
+    titles, labels, limits and color cycle are put back. A figure changed
+    in ways that reset cannot undo (another Axes, a colorbar, a log scale,
+    dates, tick or spine changes, figure texts) is closed instead, as is
+    one made under different rcParams than those active when it is handed
+    out, so pooled charts look exactly like fresh ones. Idle figures stay
+    registered with pyplot; `created`, `reused` and `discarded` count what
+    happened to them.
+    """
+
+    def __init__(self, size=4):
+        self.size = size
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self._idle = []
+        self._busy = {}
+
+    def __repr__(self):
+        return f"FigurePool({len(self._idle)} idle, {len(self._busy)} in use, {self.reused} reused)"
+
+    def __contains__(self, fig):
+        return fig in self._busy or self.is_idle(fig)
+
+    def is_idle(self, fig):
+        return any(idle is fig for idle, _, _ in self._idle)
+
+    def _make(self):
+        fig = pyplot.figure()
+        ax = fig.add_subplot()
+        self.created += 1
+        return fig, ax, _Baseline(fig, ax)
+
+    def fill(self, count=None):
+        """Make figures up front until `count` (default `size`) are idle."""
+        current = pyplot.gcf() if pyplot.get_fignums() else None
+        for _ in range(max((self.size if count is None else count) - len(self._idle), 0)):
+            self._idle.append(self._make())
+        if current is not None:
+            pyplot.figure(current)
+
+    def acquire(self):
+        """An idle figure and its Axes, made current; a new one if none fits."""
+        rc = rc_digest()
+        for fig in [fig for fig in self._busy if not pyplot.fignum_exists(fig.number)]:
+            # closed with pyplot.close rather than released
+            del self._busy[fig]
+        while self._idle:
+            fig, ax, baseline = self._idle.pop()
+            if not pyplot.fignum_exists(fig.number):
+                # closed behind the pool's back
+                continue
+            if baseline.rc != rc:
+                self._discard(fig)
+                continue
+            pyplot.figure(fig)
+            fig.set_size_inches(pyplot.rcParams['figure.figsize'])
+            self.reused += 1
+            break
+        else:
+            fig, ax, baseline = self._make()
+        self._busy[fig] = (ax, baseline)
+        return fig, ax
+
+    def release(self, fig):
+        """
+        Take back `fig` and reset it for reuse, or close it if it cannot be
+        reset or `size` figures are idle already. False if `fig` is not one
+        the pool handed out.
+        """
+        if fig not in self._busy:
+            return False
+        ax, baseline = self._busy.pop(fig)
+        if (len(self._idle) >= self.size or not pyplot.fignum_exists(fig.number)
+                or not baseline.matches(fig, ax) or not self._reset(ax, baseline)):
+            self._discard(fig)
+        else:
+            self._idle.append((fig, ax, baseline))
+        return True
+
+    def _reset(self, ax, baseline):
+        # callbacks left by the chart (downsampling, streams) would keep its data alive
+        for registry, kept in zip((ax.callbacks, ax.figure.canvas.callbacks), baseline.callbacks):
+            for cid in _cids(registry) - kept:
+                registry.disconnect(cid)
+        try:
+            for child in ax.get_children():
+                if child not in baseline.children:
+                    child.remove()
+        except NotImplementedError:
+            return False
+        ax.containers.clear()
+        for loc in ('left', 'center', 'right'):
+            ax.set_title('', loc=loc)
+        ax.set_xlabel('')
+        ax.set_ylabel('')
+        ax.dataLim.set(Bbox.null())
+        ax.ignore_existing_data_limits = True
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.set_autoscale_on(True)
+        ax.set_prop_cycle(None)
+        return True
+
+    def _discard(self, fig):
+        pyplot.close(fig)
+        self.discarded += 1
+
+    def close(self):
+        """Close every figure the pool holds, idle or in use."""
+        for fig, _, _ in self._idle:
+            pyplot.close(fig)
+        for fig in self._busy:
+            pyplot.close(fig)
+        self._idle.clear()
+        self._busy.clear()
@@ -0,0 +1,173 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+import numpy as np
+from matplotlib.lines import Line2D
+from matplotlib.transforms import nonsingular
+
+from customplotlib import columns
+
+
+# +
+class RingBuffer:
+    """
+    The last `size` values appended, readable as one contiguous array.
+
+    Values are written into twice the needed space and the live window is
+    copied back to the front when the end is reached, so appends cost O(1)
+    amortized, reads never copy and memory never exceeds 2 * size values.
+    """
+
+    def __init__(self, size, dtype=float):
+        self.size = int(size)
+        self._data = np.empty(2 * self.size, dtype)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def values(self):
+        return self._data[self._start:self._end]
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype).ravel()
+        count = len(values)
+        if count >= self.size:
+            self._data[:self.size] = values[-self.size:]
+            self._start, self._end = 0, self.size
+            return
+        if self._end + count > len(self._data):
+            keep = min(len(self), self.size - count)
+            self._data[:keep] = self._data[self._end - keep:self._end]
+            self._start, self._end = 0, keep
+        self._data[self._end:self._end + count] = values
+        self._end += count
+        self._start = max(self._start, self._end - self.size)
+
+
+class Stream:
+    """
+    A live line chart on `ax` that keeps the last `window` points per label.
+
+    append() writes into one pair of RingBuffers per label and updates that
+    label's line in place. The lines are animated, so a refresh restores the
+    saved background of the axes and redraws just the lines, then blits the
+    axes. The whole figure is only redrawn when a new label joins the legend
+    or the data leaves the view limits; the limits are then set with
+    `margin` of headroom, so a scrolling stream rescales once every
+    `margin` of a window rather than on every append.
+    """
+
+    def __init__(self, ax, window=10000, legend_loc=None, margin=0.25, autoscale=True, **kwargs):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.window = int(window)
+        self.legend_loc = legend_loc
+        self.margin = margin
+        self.autoscale = autoscale
+        self.kwargs = kwargs
+        self.buffers = {}
+        self.lines = {}
+        self._background = None
+        self._cid = self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def append(self, x, y, label=None):
+        """
+        Add points to the stream. `label` is one label for all points or
+        one per point; points with a missing per-point label are dropped.
+        """
+        ax = self.ax
+        ax.xaxis.update_units(x)
+        ax.yaxis.update_units(y)
+        x = np.atleast_1d(np.asarray(ax.convert_xunits(np.asarray(x)), dtype=float))
+        y = np.atleast_1d(np.asarray(ax.convert_yunits(np.asarray(y)), dtype=float))
+
+        if label is None or np.ndim(label) == 0:
+            parts = [(label, x, y)]
+        else:
+            names, groups = columns.group_indices(np.asarray(label))
+            parts = [(name, x[group], y[group]) for name, group in zip(names, groups)]
+
+        redraw = False
+        for name, xs, ys in parts:
+            if name not in self.buffers:
+                self._add_line(name)
+                redraw = redraw or name is not None
+            xbuf, ybuf = self.buffers[name]
+            xbuf.extend(xs)
+            ybuf.extend(ys)
+            self.lines[name].set_data(xbuf.values, ybuf.values)
+
+        if self.autoscale and self._rescale(x, y):
+            redraw = True
+        self.refresh(redraw)
+
+    def _add_line(self, name):
+        kwargs = dict(self.kwargs)
+        kwargs.setdefault('color', self.ax._get_lines.get_next_color())
+        line = Line2D([], [], label=name if name is not None else '_nolegend_', animated=True, **kwargs)
+        self.ax.add_line(line)
+        self.buffers[name] = (RingBuffer(self.window), RingBuffer(self.window))
+        self.lines[name] = line
+        if name is not None and self.legend_loc is not None:
+            self.ax.legend(bbox_to_anchor=self.legend_loc)
+
+    def _rescale(self, x, y):
+        """
+        New view limits around all buffered data if the points just added
+        fall outside the current ones; True if the limits changed.
+        """
+        changed = False
+        for axis, new, get, set_ in ((0, x, self.ax.get_xlim, self.ax.set_xlim),
+                                     (1, y, self.ax.get_ylim, self.ax.set_ylim)):
+            new = new[np.isfinite(new)]
+            low, high = sorted(get())
+            if not len(new) or (low <= new.min() and new.max() <= high):
+                continue
+            values = [buffers[axis].values for buffers in self.buffers.values() if len(buffers[axis])]
+            lo = min(np.nanmin(v) for v in values)
+            hi = max(np.nanmax(v) for v in values)
+            lo, hi = nonsingular(lo, hi)
+            pad = (hi - lo) * self.margin
+            set_(lo - pad, hi + pad)
+            changed = True
+        return changed
+
+    def _on_draw(self, event):
+        # a full draw leaves out the animated lines: save it, then add them
+        if self.canvas.is_saving():
+            return
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_lines()
+
+    def _draw_lines(self):
+        for line in self.lines.values():
+            self.ax.draw_artist(line)
+
+    def refresh(self, redraw=False):
+        """Blit the lines over the saved background, or redraw everything."""
+        if redraw or self._background is None or not self.canvas.supports_blit:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_lines()
+            self.canvas.blit(self.ax.bbox)
+        self.canvas.flush_events()
+
+    def close(self):
+        """Stop following draws of the figure."""
+        self.canvas.mpl_disconnect(self._cid)
@@ -0,0 +1,105 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from matplotlib.tri import Triangulation
+
+
+# +
+# triangulations of the most recently plotted x/y domains
+CACHE_SIZE = 16
+
+_TRIANGULATIONS = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def fingerprint(x, y):
+    """Digest of the values, dtype and shape of the x and y arrays."""
+    digest = hashlib.blake2b(digest_size=16)
+    for values in (x, y):
+        values = np.ascontiguousarray(values)
+        digest.update(f'{values.dtype.str}{values.shape}'.encode())
+        digest.update(values.data)
+    return digest.hexdigest()
+
+
+def triangulation(x, y):
+    """
+    Delaunay Triangulation of the points (x, y), reused while the same x/y
+    domain keeps being plotted.
+    """
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    key = fingerprint(x, y)
+    with _LOCK:
+        if key in _TRIANGULATIONS:
+            _TRIANGULATIONS.move_to_end(key)
+            return _TRIANGULATIONS[key]
+    # triangulate outside the lock; a concurrent miss just does it twice
+    tri = Triangulation(x.copy(), y.copy())
+    tri.get_cpp_triangulation()
+    with _LOCK:
+        _TRIANGULATIONS[key] = tri
+        while len(_TRIANGULATIONS) > CACHE_SIZE:
+            _TRIANGULATIONS.popitem(last=False)
+    return tri
+
+
+def clear_cache():
+    with _LOCK:
+        _TRIANGULATIONS.clear()
+
+
+def as_grid(x, y, z):
+    """
+    (X, Y, Z) as 2-D arrays if the points lie on a complete rectilinear
+    grid, in any order, otherwise None.
+    
+    Already 2-D inputs, as from np.meshgrid, are returned as they are.
+    """
+    x, y, z = np.asarray(x), np.asarray(y), np.asarray(z)
+    if x.ndim == 2 and x.shape == y.shape == z.shape:
+        return x, y, z
+    x, y, z = x.ravel(), y.ravel(), z.ravel()
+    if not x.size == y.size == z.size or x.size < 4:
+        return None
+    xs, col = np.unique(x, return_inverse=True)
+    if len(xs) < 2 or x.size % len(xs):
+        return None
+    ys, row = np.unique(y, return_inverse=True)
+    if len(ys) < 2 or len(xs) * len(ys) != x.size:
+        return None
+    cell = row * len(xs) + col
+    if np.bincount(cell, minlength=x.size).max() > 1:
+        return None
+    Z = np.empty((len(ys), len(xs)), dtype=np.result_type(z, float))
+    Z.ravel()[cell] = z
+    X, Y = np.meshgrid(xs, ys)
+    return X, Y, Z
+
+
+def strides(shape, stride=None):
+    """
+    (rstride, cstride) for plot_surface: every row and column by default,
+    or every `stride`-th, given as one number or a (rows, columns) pair.
+    """
+    if stride is None:
+        return 1, 1
+    rstride, cstride = (stride, stride) if np.isscalar(stride) else stride
+    return max(int(rstride), 1), max(int(cstride), 1)
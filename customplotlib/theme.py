@@ -0,0 +1,103 @@
+# ---
+# jupyter:
+#   jupytext:
+#     text_representation:
+#       extension: .py
+#       format_name: light
+#       format_version: '1.5'
+#       jupytext_version: 1.13.8
+#   kernelspec:
+#     display_name: Python 3 (ipykernel)
+#     language: python
+#     name: python3
+# ---
+
+# +
+import functools
+from types import MappingProxyType
+
+import matplotlib
+from cycler import cycler
+
+from customplotlib.customization.config import *
+from customplotlib.customization import processing
+
+
+# +
+TEXT_COLOR = "#3F3F3F"
+
+
+class Theme:
+    """
+    The rc settings, property cycle and colormaps of one Customplotlib look,
+    validated once and read-only afterwards.
+    
+    apply() writes them into the global rcParams in one update. context()
+    sets them only inside a `with` block, and a Theme used as a decorator
+    does the same around every call of the decorated function.
+    """
+    __slots__ = ('rc', 'colors', 'cycler', 'colormaps')
+    
+    def __init__(self, rc, colors, colormaps):
+        # validate once; lists become tuples so nothing in the theme can change
+        rc = matplotlib.RcParams(rc)
+        frozen = {key: tuple(value) if isinstance(value, list) else value for key, value in rc.items()}
+        object.__setattr__(self, 'rc', MappingProxyType(frozen))
+        object.__setattr__(self, 'colors', tuple(colors))
+        object.__setattr__(self, 'cycler', rc['axes.prop_cycle'])
+        object.__setattr__(self, 'colormaps', MappingProxyType(dict(colormaps)))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __repr__(self):
+        return f"{type(self).__name__}(colors={self.colors!r})"
+    
+    def apply(self):
+        """Make this the global theme."""
+        matplotlib.rcParams.update(self.rc)
+    
+    def context(self):
+        """Context manager applying the theme until the block exits."""
+        return matplotlib.rc_context(self.rc)
+    
+    def __call__(self, func):
+        @functools.wraps(func)
+        def themed(*args, **kwargs):
+            with self.context():
+                return func(*args, **kwargs)
+        return themed
+
+
+@functools.lru_cache(maxsize=None)
+def compile_theme(colors, color_blind_mode=False, font_family=('sans-serif',), font_name='DejaVu Sans'):
+    """
+    The Theme for a palette and font, built on the first call for each
+    combination of arguments and shared after that. `colors` and
+    `font_family` must be tuples.
+    """
+    if not color_blind_mode:
+        prop_cycle = cycler(color=colors)
+    else:
+        prop_cycle = (cycler(linestyle=LINESTYLES[:len(colors)]) +
+                      cycler(color=colors) +
+                      cycler(marker=MARKERSTYLES[:len(colors)]))
+    
+    rc = {'axes.prop_cycle': prop_cycle,
+          # the font by name, so text resolves to it outside the theme too
+          'font.family': [font_name] + list(font_family),
+          'font.sans-serif': font_name,
+          'font.size': FONT_SIZE,
+          'text.color': TEXT_COLOR,
+          'axes.labelcolor': TEXT_COLOR,
+          'xtick.color': TEXT_COLOR,
+          'ytick.color': TEXT_COLOR,
+          'axes.labelsize': FONT_SIZE,
+          'axes.titlesize': TITLE_SIZE,
+          'axes.titleweight': 'bold',
+          'figure.titlesize': TITLE_SIZE,
+          'figure.figsize': FIGSIZE,
+          'lines.markersize': MARKERSIZE,
+          'lines.linewidth': 2}
+    colormaps = {name: processing.get_gradient(name) for name in GRADIENTS}
+    return Theme(rc, colors, colormaps)
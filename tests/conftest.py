@@ -0,0 +1,4 @@
+import matplotlib
+
+# tests always run headless
+matplotlib.use('Agg')
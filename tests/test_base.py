@@ -0,0 +1,52 @@
+import matplotlib.dates as mdates
+import matplotlib.pyplot as pyplot
+import numpy as np
+import pandas as pd
+import pytest
+
+from customplotlib.base import Customplotlib
+
+
+@pytest.fixture
+def plt():
+    plt = Customplotlib(override_autosave=False)
+    yield plt
+    pyplot.close('all')
+
+
+@pytest.mark.parametrize('method', ['plot', 'scatter'])
+def test_single_label_without_data(plt, method):
+    chart = getattr(plt, method)(x=[1, 2, 3], y=[1, 2, 3], label='series')
+    assert [text.get_text() for text in plt.gca().get_legend().get_texts()] == ['series']
+    chart.update(x=[1, 2, 3, 4], y=[4, 3, 2, 1])
+
+
+def test_update_keeps_other_artists_in_view(plt):
+    chart = plt.plot(x=np.arange(10), y=np.arange(10))
+    plt.scatter(x=np.arange(100, 110), y=np.arange(10))
+    chart.update(x=np.arange(10), y=np.arange(10)[::-1] * 2)
+    low, high = plt.gca().get_xlim()
+    assert low < 0 and high > 109
+    assert plt.gca().get_ylim()[1] > 18
+
+
+@pytest.mark.parametrize('label', [None, 'series'])
+def test_downsampled_dates_keep_a_date_axis(plt, label):
+    x = pd.date_range('2020-01-01', periods=5000, freq='min')
+    y = np.random.default_rng(0).normal(size=len(x)).cumsum()
+    chart = plt.plot(x=x, y=y, label=label, downsample='lttb')
+    ax = plt.gca()
+    assert isinstance(ax.xaxis.get_major_formatter(), mdates.AutoDateFormatter)
+    assert ax.get_xlim()[1] < 1e6
+    chart.update(x=x, y=y[::-1], label=label)
+    assert ax.get_lines()[0].get_xdata().max() < 1e6
+
+
+@pytest.mark.parametrize('downsample', [None, 'lttb'])
+def test_unlabeled_columns_of_data(plt, downsample):
+    df = pd.DataFrame({'t': np.arange(5000.), 'y': np.random.default_rng(0).normal(size=5000).cumsum()})
+    plt.instrument()
+    plt.plot(x='t', y='y', data=df, downsample=downsample)
+    line, = plt.gca().get_lines()
+    assert line.get_xdata().max() == 4999
+    assert plt.stats.records[-1].sizes['rows'] == 5000
@@ -0,0 +1,59 @@
+import os
+
+import matplotlib.pyplot as pyplot
+import numpy as np
+
+from customplotlib import cache as caching
+from customplotlib import chart as charting
+from customplotlib.base import Customplotlib
+
+
+def test_hit_draws_the_chart_and_copies_the_autosave(tmp_path):
+    plt = Customplotlib(cache=str(tmp_path / 'cache'))
+    plt.savepath = str(tmp_path / 'saved')
+    x = np.arange(10)
+    for _ in range(2):
+        chart = plt.plot(x=x, y=x * 2)
+        assert isinstance(chart, charting.Chart)
+        assert plt.gca().get_xlim()[1] > 9
+        plt.title('hello')
+        assert plt.gca().get_title() == 'hello'
+        pyplot.close('all')
+    assert plt.cache.hits == 1
+    first, second = sorted(os.listdir(tmp_path / 'saved'))
+    assert (tmp_path / 'saved' / first).read_bytes() == (tmp_path / 'saved' / second).read_bytes()
+
+
+def figure_of(value):
+    fig = pyplot.figure(figsize=(2, 2))
+    fig.gca().plot([0, 1], [0, value])
+    return fig
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = caching.RenderCache(str(tmp_path), max_bytes=10 ** 9)
+    for key in 'abc':
+        cache.write(figure_of(ord(key)), key)
+    pyplot.close('all')
+    assert cache.get('a') is not None
+    # room for three entries: adding a fourth drops b, the least recently used
+    cache.max_bytes = cache.nbytes
+    cache.write(figure_of(0), 'd')
+    pyplot.close('all')
+    assert cache.evictions >= 1
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('d') is not None
+    assert not os.path.exists(cache.path('b'))
+    assert cache.nbytes <= cache.max_bytes
+
+
+def test_unhashable_arguments_bypass_the_cache(tmp_path):
+    plt = Customplotlib(cache=str(tmp_path / 'cache'))
+    plt.savepath = str(tmp_path / 'saved')
+    fig, ax = pyplot.subplots()
+    try:
+        assert plt.dist(np.arange(100.), ax=ax, engine='fft') is ax
+    finally:
+        pyplot.close('all')
+    assert (plt.cache.hits, plt.cache.misses, len(plt.cache)) == (0, 0, 0)
+    assert len(os.listdir(tmp_path / 'saved')) == 1
@@ -0,0 +1,47 @@
+import matplotlib.pyplot as pyplot
+import numpy as np
+import pytest
+
+from customplotlib import kde
+
+sns = pytest.importorskip('seaborn')
+
+# largest allowed gap between the FFT and seaborn curves, as a fraction of seaborn's peak
+TOLERANCE = 2e-3
+
+
+def sample(case):
+    rng = np.random.default_rng(1)
+    if case == 'bimodal':
+        return np.r_[rng.normal(-3, 1, 10_000), rng.normal(4, 0.5, 10_000)], None
+    x = rng.standard_normal(20_000)
+    return x, (rng.random(20_000) if case == 'weighted' else None)
+
+
+def seaborn_curve(x, **kwargs):
+    fig, ax = pyplot.subplots()
+    try:
+        sns.kdeplot(x=x, ax=ax, **kwargs)
+        return ax.lines[0].get_data()
+    finally:
+        pyplot.close(fig)
+
+
+@pytest.mark.parametrize('bw_method', ['scott', 'silverman'])
+@pytest.mark.parametrize('case', ['normal', 'bimodal', 'weighted'])
+def test_matches_seaborn(case, bw_method):
+    x, weights = sample(case)
+    support, expected = seaborn_curve(x, weights=weights, bw_method=bw_method)
+    actual_support, actual = kde.fft_kde(x, weights=weights, bw_method=bw_method)
+    # seaborn sizes its grid from the unweighted bandwidth, so compare on its grid
+    actual = np.interp(support, actual_support, actual, left=0, right=0)
+    assert np.abs(actual - expected).max() <= TOLERANCE * expected.max()
+
+
+def test_matches_seaborn_clipped():
+    x, _ = sample('normal')
+    support, expected = seaborn_curve(x, clip=(-1, 2))
+    actual_support, actual = kde.fft_kde(x, clip=(-1, 2))
+    assert actual_support.min() >= -1 and actual_support.max() <= 2
+    np.testing.assert_allclose(actual_support, support)
+    assert np.abs(actual - expected).max() <= TOLERANCE * expected.max()
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from customplotlib.base import pie_slices
+
+
+def old_slices(df, label_col, val_col, other_threshold=0.1):
+    # the aggregation pie did before pie_slices, run on a copy
+    df = df.copy()
+    df[val_col] = df[val_col].fillna(0)
+    df[f'{val_col}_norm'] = df[val_col] / df[val_col].sum()
+    sub_df = df.sort_values(by=f'{val_col}_norm', ascending=False)[[label_col, f'{val_col}_norm']]
+    to_keep = sub_df[sub_df[f'{val_col}_norm'] >= other_threshold][label_col].unique()
+    sub_df['slice_names'] = np.where(sub_df[label_col].isin(to_keep), sub_df[label_col], 'Other')
+    to_plot = sub_df.groupby('slice_names')[f'{val_col}_norm'].sum().reset_index()
+    to_plot['rank'] = np.where(to_plot['slice_names'] == 'Other', 1, 0)
+    to_plot.sort_values(by=['rank', f'{val_col}_norm'], ascending=False, inplace=True)
+    to_plot = to_plot[to_plot[f'{val_col}_norm'] > 0]
+    return to_plot['slice_names'], to_plot[f'{val_col}_norm'] * 100
+
+
+def frame(case):
+    rng = np.random.default_rng(0)
+    labels = np.array(['a', 'b', 'c', 'd', 'e', 'f'], dtype=object)
+    df = pd.DataFrame({'label': rng.choice(labels, 200), 'value': rng.exponential(1, 200)})
+    # a few large rows, so some labels keep their own slice
+    df.loc[::7, 'value'] = np.nan
+    df.loc[1:3, 'value'] = [40, 30, 25]
+    df.loc[1:3, 'label'] = ['a', 'b', 'c']
+    if case == 'nan_labels':
+        # one missing label large enough to be kept, the others folded
+        df.loc[2, 'label'] = None
+        df.loc[50:60, 'label'] = None
+    elif case == 'other_kept':
+        df.loc[1, 'label'] = 'Other'
+    elif case == 'other_folded':
+        df.loc[100:110, 'label'] = 'Other'
+    return df
+
+
+@pytest.mark.parametrize('case', ['nan_values', 'nan_labels', 'other_kept', 'other_folded'])
+def test_matches_old_aggregation_without_mutating(case):
+    df = frame(case)
+    before = df.copy()
+    labels, values = pie_slices(df, 'label', 'value')
+    expected_labels, expected_values = old_slices(df, 'label', 'value')
+    assert labels.tolist() == expected_labels.tolist()
+    np.testing.assert_allclose(values.to_numpy(), expected_values.to_numpy())
+    pd.testing.assert_frame_equal(df, before)
@@ -0,0 +1,39 @@
+import os
+
+import matplotlib
+import matplotlib.pyplot as pyplot
+import numpy as np
+import pytest
+from matplotlib import font_manager
+
+from customplotlib.base import Customplotlib
+
+
+@pytest.fixture
+def defaults():
+    # other tests apply the theme globally; scoped instances must not need that
+    with matplotlib.rc_context():
+        matplotlib.rcdefaults()
+        yield
+    pyplot.close('all')
+
+
+def test_scoped_text_keeps_the_brand_font(defaults):
+    plt = Customplotlib(scoped=True, override_autosave=False)
+    plt.plot(x=[1, 2, 3], y=[1, 2, 3], title='Hello')
+    title = plt.gca().title
+    assert font_manager.findfont(title.get_fontproperties()) == plt.font.get_file()
+
+
+def test_scoped_background_save_matches_sync_save(defaults, tmp_path):
+    paths = []
+    for background in (False, True):
+        plt = Customplotlib(scoped=True, background_save=background)
+        plt.savepath = str(tmp_path / str(background))
+        plt.plot(x=np.arange(10), y=np.arange(10), label=np.arange(10) % 2, title='Hello')
+        plt.flush()
+        pyplot.close('all')
+        path, = os.listdir(plt.savepath)
+        paths.append(os.path.join(plt.savepath, path))
+    sync, background = (open(path, 'rb').read() for path in paths)
+    assert sync == background